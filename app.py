@@ -1,51 +1,107 @@
 import streamlit as st
-import os
-import re
-import random
-from io import BytesIO
-from collections import Counter
-from datetime import datetime
-import nltk
-from nltk.data import find
-from nltk.tokenize.punkt import PunktSentenceTokenizer
-from nltk.tokenize import wordpunct_tokenize
-from nltk.corpus import stopwords
-import textstat
-from docx import Document as DocxDocument
-from striprtf.striprtf import rtf_to_text
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import time
 from plush_utils import (
-    clean_text, analyze_text, extract_dialogue, dialogue_by_character,
-    find_cliches, export_full_report, generate_names,
-    load_docx, generate_docx, generate_pdf, STYLE_PRESETS
+    clean_text, extract_dialogue, dialogue_by_character,
+    find_cliches, generate_full_names, default_names,
+    format_report, format_full_report, export_bytes, STYLE_PRESETS, templates
 )
+from plush_cache import cached, default_cache
+from plush_metrics import collect
+from plush_io import read_text
+from plush_parallel import analyze_parallel, PARALLEL_MIN_CHARS
+from plush_incremental import IncrementalAnalyzer
+from plush_jobs import default_queue, QueueFull
 
-# ── Ensure NLTK Data ────────────────────────────────────────
-def ensure_nltk_data():
-    try:
-        find("tokenizers/punkt")
-    except:
-        nltk.download("punkt", quiet=True)
+# ── Input ───────────────────────────────────────────────────
+def load_input(c):
+    f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
+    if f:
+        # decode each upload once: job polling and export clicks rerun the script many times
+        fid = getattr(f, "file_id", None) or (f.name, f.size)
+        up = st.session_state.get("upload")
+        if up is None or up[0] != fid:
+            up = st.session_state["upload"] = (fid, read_text(f, f.name))
+        return up[1]
+    return c.text_area("Or paste your text here:", height=300)
+
+# ── Stage timings ───────────────────────────────────────────
+def timed(key, fn, *args):
+    # per-stage breakdown of this one call, kept next to its result in session state
+    with collect() as m:
+        out = fn(*args)
+    st.session_state[f"{key}_stages"] = m.snapshot()
+    return out
+
+def show_stages(c, key):
+    snap = st.session_state.get(f"{key}_stages")
+    if not st.session_state.get("show_stages") or snap is None:
+        return
+    if not snap["stages"]:
+        c.caption("⏱ Served from cache — no stages ran.")
+        return
+    rows = sorted(snap["stages"].items(), key=lambda kv: -kv[1]["seconds"])
+    c.caption("⏱ Stage timings (inclusive: outer stages contain inner ones)")
+    c.table([{"stage": k, "calls": v["calls"], "ms": round(v["seconds"] * 1000, 1),
+              "max ms": round(v["max"] * 1000, 1)} for k, v in rows])
+    if snap["counters"]:
+        c.caption(" · ".join(f"{k}: {v:,}" for k, v in snap["counters"].items()))
+
+# ── Background jobs ─────────────────────────────────────────
+# Jobs return the style-independent Analysis, so it is cached on the text alone: switching the
+# style preset and generating again is a cache hit, and only the formatting runs.
+def full_analysis_job(txt, progress=None):
+    big = len(txt) >= PARALLEL_MIN_CHARS
+    return analyze_parallel(txt, full=True, workers=None if big else 1,
+                            executor=default_queue().executor() if big else None, progress=progress)
+
+def start_job(c, key, tool, fn, *args):
+    # the job runs outside this script run, so reruns and other clicks don't cancel it
     try:
-        find("corpora/stopwords")
-    except:
-        nltk.download("stopwords", quiet=True)
+        st.session_state[f"{key}_job"] = default_queue().submit(tool, fn, *args).id
+    except QueueFull:
+        c.warning("The server is busy — please try again in a moment.")
 
-ensure_nltk_data()
+def poll_job(c, key):
+    # returns the result once the job is finished; until then shows progress and reruns
+    job_id = st.session_state.get(f"{key}_job")
+    job = default_queue().get(job_id) if job_id else None
+    if job is None:
+        st.session_state.pop(f"{key}_job", None)
+        return None
+    if not job.ready:
+        c.progress(job.progress, text=f"Working… {job.done}/{job.total or '?'} chunks")
+        time.sleep(0.5)
+        st.rerun()
+    del st.session_state[f"{key}_job"]
+    if job.state != "done":
+        c.error(f"Job failed: {job.error or job.state}")
+        return None
+    st.session_state[f"{key}_stages"] = job.stages or {"stages": {}, "counters": {}}
+    return default_queue().result(job)
 
-# ── Last-name support ────────────────────────────────────────
-COMMON_LAST_NAMES = [
-    "Smith","Johnson","Williams","Brown","Jones","Miller","Davis",
-    "Garcia","Rodriguez","Wilson","Martinez","Anderson","Taylor"
-]
-RARE_LAST_NAMES = [
-    "Hawthorne","Lockwood","Fairchild","Blackwood","Ashford",
-    "Everhart","Sterling","Winslow","Briarwood","Thornfield"
-]
-def generate_last_names(rarity, count):
-    pool = RARE_LAST_NAMES if rarity == "Rare" else COMMON_LAST_NAMES
-    return random.sample(pool, min(count, len(pool)))
+# ── Results & lazy exports ──────────────────────────────────
+def show_result(c, key, heading, text, fname, title=None, height=300):
+    # Results live in session state so the extra rerun from an export click keeps them on screen.
+    if text is not None:
+        st.session_state[key] = text
+        for fmt in ("docx", "pdf"):
+            st.session_state.pop(f"{key}_{fmt}", None)
+    text = st.session_state.get(key)
+    if text is None:
+        return
+    c.subheader(heading)
+    c.text_area("", text, height=height)
+    c.download_button("Download .txt", text, f"{fname}.txt")
+    show_stages(c, key)
+    if title is None:
+        return
+    fmt = c.radio("Export as", ["docx", "pdf"], horizontal=True, key=f"{key}_fmt")
+    if c.button(f"Prepare .{fmt}", key=f"{key}_prep"):
+        st.session_state[f"{key}_{fmt}"] = timed(f"{key}_{fmt}", export_bytes, title, text, fmt)
+    data = st.session_state.get(f"{key}_{fmt}")
+    if data is not None:
+        c.download_button(f"Download .{fmt}", data, f"{fname}.{fmt}")
+        show_stages(c, f"{key}_{fmt}")
 
 # ── Main App ────────────────────────────────────────────────
 def main():
@@ -72,6 +128,13 @@ def main():
         if st.sidebar.button(t):
             st.session_state.active_tool = t
 
+    cs = default_cache().stats()
+    st.sidebar.caption(f"Cache: {cs['hits']} hits / {cs['misses']} misses · {cs['items']} items")
+    js = default_queue().stats()
+    if js["queued"] or js["running"]:
+        st.sidebar.caption(f"Jobs: {js['running']} running · {js['queued']} queued")
+    st.sidebar.checkbox("Show stage timings", key="show_stages")
+
     choice = st.session_state.active_tool
     c = st.container()
 
@@ -89,7 +152,7 @@ def main():
          🔍  **Analyze Text** — Readability, passive-voice, long-sentence alerts  
          🗣  **Extract Dialogue** — Pull every line of spoken text  
          💣  **Cliché Buster** — Hunt down tired clichés  
-         🎲  **Name Generator** — Instant first & last names (10 by default!)  
+         🎲  **Name Generator** — Thousands of unique names, by origin, initial & syllables  
          📦  **Full Report** — All of the above in one handy download  
         """)
 
@@ -109,162 +172,104 @@ def main():
     # ── CLEAN TEXT ────────────────────────────────────────
     elif choice == "Clean Text":
         c.title("🧼 Clean Text")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
+        keep = c.checkbox("Keep paragraph breaks", value=True)
+        out = None
         if c.button("🧼 Clean", key="clean"):
-            out = clean_text(raw)
-            c.subheader("✅ Cleaned Text")
-            c.text_area("", out, height=300)
-            c.download_button("Download .txt", out, "cleaned.txt")
-            c.download_button("Download .docx", generate_docx("Cleaned Text", out), "cleaned.docx")
-            c.download_button("Download .pdf", generate_pdf("Cleaned Text", out), "cleaned.pdf")
+            out = timed("clean_out", cached, "clean_text", clean_text, raw, keep)
+        show_result(c, "clean_out", "✅ Cleaned Text", out, "cleaned", "Cleaned Text")
 
     # ── ANALYZE TEXT ───────────────────────────────────────
     elif choice == "Analyze Text":
         c.title("🔍 Analyze Text")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
         style = c.selectbox("Style Preset", list(STYLE_PRESETS.keys()))
+        watch = c.text_input("Watch words (comma-separated)", "")
+        watchlist = tuple(w.strip() for w in watch.split(",") if w.strip()) or None
         if c.button("🔍 Analyze", key="analyze"):
-            rpt = analyze_text(raw, style)
-            c.subheader("📊 Analysis Report")
-            c.text_area("", rpt, height=400)
-            c.download_button("Download .txt", rpt, "report.txt")
-            c.download_button("Download .docx", generate_docx("Analysis Report", rpt), "analysis.docx")
-            c.download_button("Download .pdf", generate_pdf("Analysis Report", rpt), "analysis.pdf")
+            # one incremental analyzer per session and watchlist: re-submitting an edited
+            # chapter only re-analyzes the blocks that changed
+            inc = st.session_state.setdefault("incremental", {}).setdefault(watchlist, IncrementalAnalyzer(watchlist))
+            big = len(raw) >= PARALLEL_MIN_CHARS
+            start_job(c, "analyze_out", "analyze_incremental",
+                      lambda t, w, progress: inc.analyze(t, progress, default_queue().executor() if big else None),
+                      raw, watchlist)
+        a = poll_job(c, "analyze_out")
+        rpt = format_report(a, style) if a is not None else None
+        show_result(c, "analyze_out", "📊 Analysis Report", rpt, "analysis", "Analysis Report", height=400)
 
     # ── EXTRACT DIALOGUE ───────────────────────────────────
     elif choice == "Extract Dialogue":
         c.title("🗣 Extract Dialogue")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
+        dlg = None
         if c.button("🗣 Extract", key="extract"):
-            dlg = extract_dialogue(raw)
-            c.subheader("🗣 Extracted Dialogue")
-            c.text_area("", dlg, height=300)
-            c.download_button("Download .txt", dlg, "dialogue.txt")
+            dlg = timed("extract_out", cached, "extract_dialogue", extract_dialogue, raw)
+        show_result(c, "extract_out", "🗣 Extracted Dialogue", dlg, "dialogue")
 
     # ── DIALOGUE BY CHARACTER ─────────────────────────────
     elif choice == "Dialogue by Character":
         c.title("🧍 Dialogue by Character")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
+        rep = None
         if c.button("🧍 Show", key="by_char"):
-            rep = dialogue_by_character(raw)
-            c.subheader("🧍 Dialogue by Character")
-            c.text_area("", rep, height=300)
-            c.download_button("Download .txt", rep, "by_character.txt")
+            rep = timed("by_char_out", cached, "dialogue_by_character", dialogue_by_character, raw)
+        show_result(c, "by_char_out", "🧍 Dialogue by Character", rep, "by_character")
 
     # ── CLICHÉ BUSTER ─────────────────────────────────────
     elif choice == "Cliché Buster":
         c.title("💣 Cliché Buster")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
+        rep = None
         if c.button("💣 Bust", key="bust"):
-            rep = find_cliches(raw)
-            c.subheader("💣 Clichés Found")
-            c.text_area("", rep, height=300)
-            c.download_button("Download .txt", rep, "cliches.txt")
+            rep = timed("bust_out", cached, "find_cliches", find_cliches, raw)
+        show_result(c, "bust_out", "💣 Clichés Found", rep, "cliches")
 
     # ── FULL REPORT ────────────────────────────────────────
     elif choice == "Full Report":
         c.title("📦 Full Report")
-        f = c.file_uploader("Upload `.txt`, `.docx`, or `.rtf`", type=["txt","docx","rtf"])
-        if f:
-            ext = f.name.split(".")[-1].lower()
-            raw = (
-                f.read().decode("utf-8")
-                if ext == "txt"
-                else load_docx(f)
-                if ext == "docx"
-                else rtf_to_text(f.read().decode("utf-8"))
-            )
-        else:
-            raw = c.text_area("Or paste your text here:", height=300)
+        raw = load_input(c)
         style = c.selectbox("Style Preset", list(STYLE_PRESETS.keys()))
         if c.button("Generate Report", key="full_report"):
-            fr = export_full_report(raw, style)
-            c.subheader("📦 Full Report")
-            c.text_area("", fr, height=400)
-            c.download_button("Download .txt", fr, "full_report.txt")
-            c.download_button("Download .docx", generate_docx("Full Report", fr), "full_report.docx")
-            c.download_button("Download .pdf", generate_pdf("Full Report", fr), "full_report.pdf")
+            start_job(c, "full_report_out", "full_analysis", full_analysis_job, raw)
+        a = poll_job(c, "full_report_out")
+        fr = format_full_report(a, style) if a is not None else None
+        show_result(c, "full_report_out", "📦 Full Report", fr, "full_report", "Full Report", height=400)
 
     # ── CHARACTER NAME GENERATOR ───────────────────────────
     elif choice == "Character Name Generator":
         c.title("🎲 Character Name Generator")
+        db = default_names()
         gender = c.selectbox("Gender", ["Any", "Male", "Female"])
-        rarity = c.selectbox("Rarity", ["Common", "Rare"])
-        count = c.number_input("How many names?", 1, 10, 10)
+        rarity = c.selectbox("Rarity", ["Any", "Common", "Rare"], index=1)
+        origin = c.multiselect("Origin", db.values("origin"))
+        initials = c.text_input("First letter(s)", placeholder="e.g. A, M")
+        syllables = c.multiselect("Syllables (first name)", db.values("syllables"))
+        count = c.number_input("How many names?", 1, 10000, 10)
+        seed = c.number_input("Seed (0 = random)", 0, 2**31 - 1, 0)
         if c.button("🎲 Generate Names", key="make_names"):
-            firsts = generate_names(gender, rarity, count)
-            lasts = generate_last_names(rarity, count)
-            fullns = [f"{f} {l}" for f, l in zip(firsts, lasts)]
-            c.subheader("🎲 Generated Names")
-            for name in fullns:
-                c.write(f"- {name}")
+            filters = {"origin": origin or None, "syllables": syllables or None,
+                       "initial": [ch for ch in initials.upper() if ch.isalpha()] or None}
+            st.session_state.names_out = generate_full_names(gender, rarity, int(count), int(seed) or None, **filters)
+        names = st.session_state.get("names_out")
+        if names is not None:
+            c.subheader(f"🎲 Generated Names ({len(names)})")
+            if not names:
+                c.write("No names match those filters.")
+            else:
+                text = "\n".join(names)
+                c.text_area("", text, height=300)
+                c.download_button("Download .txt", text, "names.txt")
+                c.download_button("Download .csv", "first,last\n" + "\n".join(n.replace(" ", ",", 1) for n in names), "names.csv")
 
     # ── TEMPLATES ──────────────────────────────────────────
     elif choice == "Templates":
         c.title("📑 Templates Library")
         tpl_choice = c.selectbox("Pick a template", list(templates.keys()))
+        t = None
         if c.button("Show Template", key="show_tpl"):
             t = templates[tpl_choice]
-            c.subheader(f"📑 {tpl_choice}")
-            c.text_area("", t, height=400)
-            c.download_button("Download .txt", t, f"{tpl_choice}.txt")
-            c.download_button("Download .docx", generate_docx(tpl_choice, t), f"{tpl_choice}.docx")
-            c.download_button("Download .pdf", generate_pdf(tpl_choice, t), f"{tpl_choice}.pdf")
+        show_result(c, f"tpl_{tpl_choice}", f"📑 {tpl_choice}", t, tpl_choice, tpl_choice, height=400)
 
 if __name__ == "__main__":
     main()
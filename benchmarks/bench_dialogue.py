@@ -0,0 +1,50 @@
+import argparse, os, sys, time
+
+HERE=os.path.dirname(os.path.abspath(__file__)); ROOT=os.path.dirname(HERE)
+sys.path[:0]=[ROOT,HERE]
+from plush_dialogue import DialogueEngine
+from corpus import manuscript
+
+# (text, [(quote, speaker), ...])
+LABELED = [
+    ("“Hi,” said John. “Hello,” she replied.", [("Hi,","John"),("Hello,","she")]),
+    ("“Out,” he said.", [("Out,","he")]),
+    ("“Halt!” shouted Captain Reyes.", [("Halt!","Captain Reyes")]),
+    ("“Halt!” Captain Reyes shouted.", [("Halt!","Captain Reyes")]),
+    ("Captain Reyes said, “Halt.” “Now.”", [("Halt.","Captain Reyes"),("Now.","Captain Reyes")]),
+    ("“Hi,” Mara said. “How are you?”\n\n“Fine.”", [("Hi,","Mara"),("How are you?","Mara"),("Fine.",None)]),
+    ("“Hi,” Mara said softly.", [("Hi,","Mara")]),
+    ("The Doctor said, “Wait.”", [("Wait.","Doctor")]),
+    ("“Wait,” said the guard.", [("Wait,",None)]),
+    ("“Hm,” she said. “Well.”", [("Hm,","she"),("Well.","she")]),
+    ("She turned. “Run,” said Mara Lee Jones.", [("Run,","Mara Lee Jones")]),
+    ("“Go,” Tom said. “Now,” she asked. “Why?” Tom asked.", [("Go,","Tom"),("Now,","she"),("Why?","Tom")]),
+]
+
+def check(engine):
+    bad=[]
+    for txt,want in LABELED:
+        got=[(h.text,h.speaker) for h in engine.lines(txt)]
+        if got!=want: bad.append((txt,want,got))
+    return bad
+
+def best_of(fn, repeat):
+    t=[]
+    for _ in range(repeat):
+        t0=time.perf_counter(); fn(); t.append(time.perf_counter()-t0)
+    return min(t)
+
+def main():
+    ap=argparse.ArgumentParser(description="Check dialogue attribution on labeled cases and time it on prose")
+    ap.add_argument("--words",type=int,default=100000)
+    ap.add_argument("--repeat",type=int,default=3)
+    a=ap.parse_args()
+    eng=DialogueEngine(); bad=check(eng)
+    print(f"{len(LABELED)-len(bad)}/{len(LABELED)} labeled cases attributed correctly")
+    for txt,want,got in bad: print(f"  {txt!r}\n    want {want}\n    got  {got}")
+    txt=manuscript(a.words); n=len(eng.lines(txt)); t=best_of(lambda: eng.lines(txt),a.repeat)
+    print(f"{a.words} words, {n} quotes in {t:.4f}s ({a.words/t:,.0f} words/s)")
+    sys.exit(1 if bad else 0)
+
+if __name__=="__main__":
+    main()
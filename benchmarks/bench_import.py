@@ -0,0 +1,46 @@
+import argparse, os, shutil, statistics, subprocess, sys, tempfile, time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_CALL="import plush_utils as p; p.analyze_text('It was decided. He just left.', 'None')"
+
+def cold(src, code, runs, env):
+    times=[]
+    for _ in range(runs):
+        t0=time.perf_counter()
+        subprocess.run([sys.executable,"-c",code],cwd=src,env=env,check=True,
+                       stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter()-t0)
+    return times
+
+def checkout(ref):
+    d=tempfile.mkdtemp(prefix="plush_ref_")
+    arc=subprocess.run(["git","archive",ref],cwd=ROOT,check=True,capture_output=True).stdout
+    subprocess.run(["tar","-x","-C",d],input=arc,check=True)
+    return d
+
+def main():
+    ap=argparse.ArgumentParser(description="Cold-start cost of importing plush modules in fresh interpreters")
+    ap.add_argument("--modules",default="plush_utils,plush_cli")
+    ap.add_argument("--runs",type=int,default=7)
+    ap.add_argument("--ref",help="git revision to compare against, e.g. HEAD~1")
+    ap.add_argument("--offline",action="store_true",help="set PLUSH_OFFLINE=1 (no NLTK downloads; the NLTK data must be installed)")
+    a=ap.parse_args()
+    env=dict(os.environ,PYTHONDONTWRITEBYTECODE="1")
+    if a.offline: env["PLUSH_OFFLINE"]="1"
+    trees=[("working tree",ROOT)]
+    if a.ref: trees.append((a.ref,checkout(a.ref)))
+    base=cold(ROOT,"pass",a.runs,env)
+    print(f"{'interpreter startup':<34} median {statistics.median(base)*1000:8.1f} ms")
+    try:
+        for label,src in trees:
+            jobs=[(f"import {m}",f"import {m}") for m in a.modules.split(",") if os.path.exists(os.path.join(src,m+".py"))]
+            jobs.append(("import + first analyze_text",FIRST_CALL))
+            for name,code in jobs:
+                t=cold(src,code,a.runs,env)
+                print(f"[{label}] {name:<30} median {statistics.median(t)*1000:8.1f} ms  "
+                      f"min {min(t)*1000:8.1f} ms")
+    finally:
+        for label,src in trees[1:]: shutil.rmtree(src,ignore_errors=True)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse, os, re, sys, time
+
+HERE=os.path.dirname(os.path.abspath(__file__)); ROOT=os.path.dirname(HERE)
+sys.path[:0]=[ROOT,HERE]
+from plush_passive import PassiveDetector
+from corpus import manuscript
+
+# the detector plush_utils used before the token-based one
+LEGACY = re.compile(r"\b(was|were).*?\b\w+ed\b", re.I)
+
+# (sentence, is passive)
+LABELED = [
+    ("The door was opened by the guard.", True),
+    ("The letters were burned before dawn.", True),
+    ("The cake has been eaten.", True),
+    ("He is being watched.", True),
+    ("The city was taken in a single night.", True),
+    ("Mistakes were made.", True),
+    ("The song was sung at every wedding.", True),
+    ("Her name is known to everyone here.", True),
+    ("The bridge was quickly rebuilt.", True),
+    ("The papers are kept in a locked drawer.", True),
+    ("The rules weren't written down anywhere.", True),
+    ("They were told to wait outside.", True),
+    ("The thief was never caught.", True),
+    ("The house is said to be haunted.", True),
+    ("The window had been broken for years.", True),
+    ("The horses were fed and watered.", True),
+    ("She was chosen to lead them.", True),
+    ("The message is sent every morning.", True),
+    ("The war was fought over nothing.", True),
+    ("The child was found asleep in the barn.", True),
+    ("She walked to the market.", False),
+    ("He was tired of waiting, so he walked away.", False),
+    ("They were in the garden when it rained.", False),
+    ("The dog was a mutt who wandered the docks.", False),
+    ("She was the one who painted the mural.", False),
+    ("We were happy, and then it ended.", False),
+    ("He was walking home when the storm started.", False),
+    ("It was a hundred miles to the coast.", False),
+    ("I was there when she needed help.", False),
+    ("They were friends long before anyone noticed.", False),
+    ("The river is wide and cold.", False),
+    ("He opened the letter and read it twice.", False),
+    ("She was indeed the best rider in town.", False),
+    ("We are going to the fair tomorrow.", False),
+    ("The soldiers were brave, and they marched on.", False),
+    ("It was late; the candles burned low.", False),
+    ("Was it you who called?", False),
+    ("The old man was sure that someone had followed him.", False),
+    ("They were out of bread, so she baked more.", False),
+    ("He is a man who has travelled far.", False),
+]
+
+def accuracy(predict):
+    tp=fp=fn=tn=0
+    for s,label in LABELED:
+        p=bool(predict(s))
+        tp+=p and label; fp+=p and not label; fn+=(not p) and label; tn+=(not p) and (not label)
+    prec=tp/(tp+fp) if tp+fp else 0.0; rec=tp/(tp+fn) if tp+fn else 0.0
+    return {"precision":prec,"recall":rec,"f1":2*prec*rec/(prec+rec) if prec+rec else 0.0,"accuracy":(tp+tn)/len(LABELED)}
+
+def best_of(fn, repeat):
+    t=[]
+    for _ in range(repeat):
+        t0=time.perf_counter(); fn(); t.append(time.perf_counter()-t0)
+    return min(t)
+
+def main():
+    ap=argparse.ArgumentParser(description="Compare the token passive detector with the legacy regex")
+    ap.add_argument("--words",type=int,default=100000)
+    ap.add_argument("--runon",type=int,default=20000,help="tokens in the pathological run-on sentence")
+    ap.add_argument("--repeat",type=int,default=3)
+    a=ap.parse_args()
+    det=PassiveDetector()
+    legacy=lambda s: LEGACY.search(s); token=lambda s: det.search(s)
+    print(f"{'':<10}{'precision':>10}{'recall':>8}{'f1':>6}{'acc':>6}   ({len(LABELED)} labeled sentences)")
+    for name,fn in (("regex",legacy),("token",token)):
+        r=accuracy(fn); print(f"{name:<10}{r['precision']:>10.2f}{r['recall']:>8.2f}{r['f1']:>6.2f}{r['accuracy']:>6.2f}")
+
+    # prose: sentence by sentence, as the analyzer runs it
+    sents=[s for s in re.split(r"(?<=[.!?])\s+",manuscript(a.words)) if s]
+    # run-on: one "sentence" with many auxiliaries and no -ed word, where the lazy scan goes quadratic
+    runon=" ".join(["he was there and she was here"]*(a.runon//7))
+    print(f"\n{'':<10}{'prose s':>10}{'words/s':>12}{'run-on s':>11}")
+    for name,fn in (("regex",legacy),("token",token)):
+        tp=best_of(lambda: [fn(s) for s in sents],a.repeat)
+        tr=best_of(lambda: list(LEGACY.finditer(runon)) if name=="regex" else det.findall(runon),a.repeat)
+        print(f"{name:<10}{tp:>10.4f}{a.words/tp:>12,.0f}{tr:>11.4f}")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse, json, os, resource, subprocess, sys, tempfile, time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE="The lantern swung in the wind while the crew argued about the map, the tide, and who had eaten the last of the biscuits."
+
+def run_one(pages, sink):
+    sys.path.insert(0,ROOT)
+    from plush_pdf import write_pdf
+    n_lines=pages*50-1  # a letter page holds 50 unwrapped 12pt lines; the title takes one
+    lines=(f"{i}: {LINE[:90]}" for i in range(n_lines))
+    t0=time.perf_counter()
+    if sink=="file":
+        with tempfile.TemporaryFile() as f: got=write_pdf(f,"Benchmark",lines); size=f.tell()
+    else:
+        from io import BytesIO
+        b=BytesIO(); got=write_pdf(b,"Benchmark",lines); size=b.tell()
+    dt=time.perf_counter()-t0
+    rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform=="darwin": rss//=1024
+    return {"pages":got,"seconds":round(dt,4),"pages_per_sec":round(got/dt,1),"peak_rss_kb":rss,"bytes":size,"sink":sink}
+
+def main():
+    ap=argparse.ArgumentParser(description="Pages/sec and peak RSS of the streaming PDF renderer")
+    ap.add_argument("--pages",default="10,100,500,2000")
+    ap.add_argument("--sink",choices=["file","memory"],default="file")
+    ap.add_argument("--json",help="write results to this file")
+    ap.add_argument("--child",type=int,help=argparse.SUPPRESS)
+    a=ap.parse_args()
+    if a.child:
+        print(json.dumps(run_one(a.child,a.sink))); return
+    rows=[]
+    for p in map(int,a.pages.split(",")):
+        # one process per size so peak RSS is not inherited from a bigger run
+        out=subprocess.run([sys.executable,__file__,"--child",str(p),"--sink",a.sink],capture_output=True,text=True,check=True)
+        r=json.loads(out.stdout.strip().splitlines()[-1]); rows.append(r)
+        print(f"{r['pages']:>6} pages  {r['seconds']:>8.3f}s  {r['pages_per_sec']:>9.1f} pages/s  "
+              f"peak RSS {r['peak_rss_kb']/1024:>7.1f} MiB  {r['bytes']/1024:>9.1f} KiB out")
+    if a.json:
+        with open(a.json,"w") as f: json.dump(rows,f,indent=2)
+
+if __name__=="__main__":
+    main()
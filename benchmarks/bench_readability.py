@@ -0,0 +1,46 @@
+import argparse, os, sys, time
+
+HERE=os.path.dirname(os.path.abspath(__file__)); ROOT=os.path.dirname(HERE)
+sys.path[:0]=[ROOT,HERE]
+from plush_readability import METRICS, scores, syllables, word_syllables
+from corpus import manuscript
+
+def _textstat(txt):
+    # one call per score, as callers of textstat do; its per-call caches are cleared first
+    ts=__import__("textstat")
+    for n in dir(ts.textstat):
+        f=getattr(ts.textstat,n,None)
+        if hasattr(f,"cache_clear"): f.cache_clear()
+    return {m:getattr(ts,m)(txt) for m in METRICS}
+
+def _plush(txt):
+    syllables.cache_clear(); word_syllables.cache_clear()
+    return scores(txt)
+
+def best_of(fn, txt, repeat):
+    t=[]; out=None
+    for _ in range(repeat):
+        t0=time.perf_counter(); out=fn(txt); t.append(time.perf_counter()-t0)
+    return min(t),out
+
+def main():
+    ap=argparse.ArgumentParser(description="Compare plush_readability with per-score textstat calls")
+    ap.add_argument("--sizes",type=int,nargs="+",default=[1000,10000,100000])
+    ap.add_argument("--repeat",type=int,default=3)
+    ap.add_argument("--seed",type=int,default=1)
+    ap.add_argument("--tolerance",type=float,default=0.01)
+    a=ap.parse_args()
+    print(f"{'words':>8}{'textstat s':>12}{'plush s':>10}{'speedup':>9}{'max diff':>10}")
+    worst=0.0
+    for n in a.sizes:
+        txt=manuscript(n,seed=a.seed)
+        tt,ref=best_of(_textstat,txt,a.repeat); tp,got=best_of(_plush,txt,a.repeat)
+        diff=max(abs(ref[m]-got[m]) for m in METRICS); worst=max(worst,diff)
+        print(f"{n:>8}{tt:>12.4f}{tp:>10.4f}{tt/tp:>8.1f}x{diff:>10.4f}")
+        if diff>a.tolerance:
+            for m in METRICS:
+                if abs(ref[m]-got[m])>a.tolerance: print(f"  {m}: textstat {ref[m]} plush {got[m]}")
+    sys.exit(1 if worst>a.tolerance else 0)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse, os, random, sys
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+from plush_utils import CLICHES, FILLER_WORDS
+
+NAMES = ["Mara","Tobias","Ilse","Corwin","Nadia","Rufus","Selene","Amos","Greta","Felix"]
+NOUNS = ["door","lantern","river","letter","window","horse","garden","sword","table","storm","ship","road",
+         "field","candle","mirror","bridge","forest","kitchen","tower","market","harbor","coat","fire","map"]
+ADJS = ["old","quiet","broken","narrow","bright","cold","heavy","distant","pale","crooked","warm","empty"]
+VERBS = ["watched","crossed","opened","carried","followed","studied","pushed","reached","found","left",
+         "held","turned","passed","wanted","closed","touched"]
+PARTICIPLES = ["painted","opened","carried","closed","dropped","pushed","watched","moved","locked","burned"]
+ADVS = ["slowly","quickly","softly","carefully","again","suddenly","finally","almost"]
+SPEECH = ["said","asked","replied"]
+
+class Manuscript:
+    # Deterministic synthetic prose; rates are per sentence.
+    def __init__(self, seed=0, dialogue=0.15, cliches=0.02, fillers=0.25, passive=0.1,
+                 long=0.05, para=5, chapter_words=4000):
+        self.r=random.Random(seed); self.dialogue=dialogue; self.cliches=cliches
+        self.fillers=fillers; self.passive=passive; self.long=long
+        self.para=para; self.chapter_words=chapter_words
+
+    def _np(self):
+        r=self.r; return f"the {r.choice(ADJS)} {r.choice(NOUNS)}" if r.random()<0.5 else f"the {r.choice(NOUNS)}"
+
+    def _clause(self):
+        r=self.r
+        if r.random()<self.passive: return f"{self._np()} was {r.choice(PARTICIPLES)} by {r.choice(NAMES)}"
+        return f"{r.choice(NAMES)} {r.choice(VERBS)} {self._np()}"
+
+    def sentence(self):
+        r=self.r; parts=[self._clause()]
+        if r.random()<self.fillers:
+            parts[0]=parts[0].replace(" ",f" {r.choice(FILLER_WORDS)} ",1)
+        if r.random()<self.long:
+            parts+=[f"{r.choice(ADVS)} {self._clause()}" for _ in range(r.randint(3,5))]
+        elif r.random()<0.3:
+            parts.append(f"{r.choice(ADVS)} {self._clause()}")
+        if r.random()<self.cliches: parts.append(f"like {r.choice(CLICHES)}")
+        s=", and ".join(parts); s=s[0].upper()+s[1:]+"."
+        if r.random()<self.dialogue:
+            q="“{}” {} {}." if r.random()<0.5 else '"{}" {} {}.'
+            s=q.format(s[:-1]+",",r.choice(SPEECH),r.choice(NAMES))
+        return s
+
+    def iter_text(self, words):
+        # yields paragraphs (with chapter headings) until roughly `words` words are produced
+        n=0; chapter=0; next_chapter=0
+        while n<words:
+            if n>=next_chapter:
+                chapter+=1; next_chapter+=self.chapter_words
+                yield f"Chapter {chapter}\n\n"
+            p=" ".join(self.sentence() for _ in range(self.r.randint(1,self.para*2-1)))
+            n+=p.count(" ")+1
+            yield p+"\n\n"
+
+    def text(self, words): return "".join(self.iter_text(words))
+
+def manuscript(words, seed=0, **rates): return Manuscript(seed,**rates).text(words)
+
+def main():
+    ap=argparse.ArgumentParser(description="Write a deterministic synthetic manuscript")
+    ap.add_argument("words",type=int)
+    ap.add_argument("-o","--out",default="-")
+    ap.add_argument("--seed",type=int,default=0)
+    for k,v in (("dialogue",0.15),("cliches",0.02),("fillers",0.25),("passive",0.1),("long",0.05)):
+        ap.add_argument(f"--{k}",type=float,default=v,help=f"per-sentence rate (default {v})")
+    a=ap.parse_args()
+    m=Manuscript(a.seed,a.dialogue,a.cliches,a.fillers,a.passive,a.long)
+    out=sys.stdout if a.out=="-" else open(a.out,"w",encoding="utf-8")
+    with out:
+        for p in m.iter_text(a.words): out.write(p)
+
+if __name__=="__main__":
+    main()
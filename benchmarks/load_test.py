@@ -0,0 +1,101 @@
+import argparse, http.client, json, os, socket, subprocess, sys, threading, time
+from collections import Counter
+from urllib.parse import urlsplit
+
+HERE=os.path.dirname(os.path.abspath(__file__)); ROOT=os.path.dirname(HERE)
+sys.path[:0]=[ROOT,HERE]
+from corpus import manuscript
+
+OPS = ("analyze","report","cliches","dialogue","readability","clean","batch")
+
+def pct(xs, p):
+    if not xs: return 0.0
+    xs=sorted(xs); return xs[min(len(xs)-1,int(round(p/100*(len(xs)-1))))]
+
+def _free_port():
+    with socket.socket() as s: s.bind(("127.0.0.1",0)); return s.getsockname()[1]
+
+def start_server(workers, inflight):
+    port=_free_port()
+    p=subprocess.Popen([sys.executable,os.path.join(ROOT,"plush_server.py"),"--port",str(port),
+                        "--workers",str(workers),"--inflight",str(inflight)],
+                       stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
+    end=time.time()+60
+    while time.time()<end:
+        try:
+            c=http.client.HTTPConnection("127.0.0.1",port,timeout=1); c.request("GET","/health")
+            if c.getresponse().status==200: return p,port
+        except OSError: time.sleep(0.2)
+    p.kill(); raise RuntimeError("plush_server did not come up")
+
+def payload(op, words, batch, seed):
+    txt=manuscript(words,seed=seed)
+    if op=="batch": return "/batch",{"items":[{"op":"analyze","text":txt}]*batch}
+    return f"/{op}",{"text":txt}
+
+def run(host, port, path, body, concurrency, requests=None, duration=None):
+    # each thread keeps one keep-alive connection; a shared ticket count or deadline ends the run
+    lat=[]; status=Counter(); lock=threading.Lock(); left=[requests]
+    deadline=time.perf_counter()+duration if duration else None
+    def take():
+        if deadline is not None: return time.perf_counter()<deadline
+        with lock:
+            if left[0]<=0: return False
+            left[0]-=1; return True
+    def worker():
+        conn=http.client.HTTPConnection(host,port,timeout=120)
+        while take():
+            t0=time.perf_counter()
+            try:
+                conn.request("POST",path,body,{"Content-Type":"application/json"})
+                r=conn.getresponse(); r.read(); code=r.status
+                if r.getheader("Connection","").lower()=="close": conn.close()
+            except (OSError,http.client.HTTPException):
+                code="error"; conn.close()
+            dt=time.perf_counter()-t0
+            with lock:
+                status[code]+=1
+                if code==200: lat.append(dt)
+        conn.close()
+    t0=time.perf_counter()
+    threads=[threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return lat,status,time.perf_counter()-t0
+
+def main():
+    ap=argparse.ArgumentParser(description="Load-test plush_server and report latency percentiles and throughput")
+    ap.add_argument("--url",help="running server, e.g. http://127.0.0.1:8765 (default: start one)")
+    ap.add_argument("--workers",type=int,default=os.cpu_count() or 1,help="workers for the server started here")
+    ap.add_argument("--inflight",type=int,default=4)
+    ap.add_argument("--op",choices=OPS,default="analyze")
+    ap.add_argument("--words",type=int,default=1000,help="words per request text")
+    ap.add_argument("--batch",type=int,default=8,help="items per /batch request")
+    ap.add_argument("-c","--concurrency",type=int,default=8)
+    ap.add_argument("-n","--requests",type=int,default=200)
+    ap.add_argument("-d","--duration",type=float,help="run for this many seconds instead of -n requests")
+    ap.add_argument("--warmup",type=int,default=10)
+    ap.add_argument("--seed",type=int,default=1)
+    ap.add_argument("-o","--output",help="write the results as JSON")
+    a=ap.parse_args()
+    proc=None
+    if a.url: u=urlsplit(a.url); host,port=u.hostname,u.port or 80
+    else: proc,port=start_server(a.workers,a.inflight); host="127.0.0.1"
+    try:
+        path,req=payload(a.op,a.words,a.batch,a.seed); body=json.dumps(req).encode()
+        if a.warmup: run(host,port,path,body,min(a.concurrency,a.warmup),a.warmup)
+        lat,status,dt=run(host,port,path,body,a.concurrency,a.requests,a.duration)
+    finally:
+        if proc is not None: proc.terminate(); proc.wait(10)
+    ok=status.get(200,0)
+    res={"op":a.op,"words":a.words,"concurrency":a.concurrency,"seconds":round(dt,3),"requests":sum(status.values()),
+         "ok":ok,"status":{str(k):v for k,v in status.items()},"rps":round(ok/dt,2) if dt else 0.0,
+         **{f"p{p}_ms":round(pct(lat,p)*1000,2) for p in (50,90,99)},"max_ms":round(max(lat,default=0)*1000,2)}
+    print(f"{res['op']} x{res['requests']} ({a.words} words, concurrency {a.concurrency}) in {res['seconds']}s")
+    print(f"  {res['rps']} req/s   p50 {res['p50_ms']} ms   p90 {res['p90_ms']} ms   p99 {res['p99_ms']} ms   max {res['max_ms']} ms")
+    print("  status: "+", ".join(f"{k}={v}" for k,v in sorted(res["status"].items())))
+    if a.output:
+        with open(a.output,"w") as f: json.dump(res,f,indent=2)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse, gc, json, os, platform, subprocess, sys, time, tracemalloc
+from datetime import datetime
+
+HERE=os.path.dirname(os.path.abspath(__file__)); ROOT=os.path.dirname(HERE)
+sys.path[:0]=[ROOT,HERE]
+import plush_utils as P
+from corpus import Manuscript
+
+FUNCS = {
+    "analyze_text":       lambda t: P.analyze_text(t, "None"),
+    "export_full_report": lambda t: P.export_full_report(t, "None"),
+    "find_cliches":       P.find_cliches,
+    "clean_text":         P.clean_text,
+    "generate_docx":      lambda t: P.generate_docx("Benchmark", t),
+    "generate_pdf":       lambda t: P.generate_pdf("Benchmark", t),
+}
+
+WARMUP = "It was decided. He just left, \u201cfor good,\u201d she said."
+
+def _reset():
+    # the syllable counts are memoized per word; clear them so every run pays full price
+    R=sys.modules.get("plush_readability")
+    if R is not None: R.syllables.cache_clear(); R.word_syllables.cache_clear()
+    gc.collect()
+
+def measure(fn, txt, repeat):
+    times=[]
+    for _ in range(repeat):
+        _reset(); t0=time.perf_counter(); fn(txt); times.append(time.perf_counter()-t0)
+    _reset(); tracemalloc.start()
+    try: fn(txt); peak=tracemalloc.get_traced_memory()[1]
+    finally: tracemalloc.stop()
+    return min(times),peak
+
+def _git_rev():
+    try: return subprocess.run(["git","rev-parse","--short","HEAD"],cwd=ROOT,capture_output=True,text=True).stdout.strip()
+    except OSError: return None
+
+def run(sizes, funcs, repeat, seed, rates, log=sys.stderr):
+    P.preload()  # tokenizer and automaton construction is a one-off, not part of each call
+    # so are first-use imports (python-docx, reportlab, ...): run each function once before timing
+    for name in funcs: FUNCS[name](WARMUP)
+    rows=[]
+    for words in sizes:
+        txt=Manuscript(seed,**rates).text(words)
+        for name in funcs:
+            sec,peak=measure(FUNCS[name],txt,repeat)
+            rows.append({"function":name,"words":words,"chars":len(txt),"seconds":round(sec,5),
+                         "words_per_sec":round(words/sec) if sec else None,"peak_mb":round(peak/1e6,3)})
+            print(f"{name:<20} {words:>9} words  {sec:>9.4f}s  {peak/1e6:>9.2f} MB peak",file=log)
+    return {"meta":{"date":datetime.now().isoformat(timespec="seconds"),"git":_git_rev(),
+                    "python":platform.python_version(),"platform":platform.platform(),
+                    "cpus":os.cpu_count(),"seed":seed,"repeat":repeat,"rates":rates},"results":rows}
+
+def compare(current, baseline, threshold):
+    # a metric regresses when it grows by more than `threshold` (0.2 = 20%) over the baseline
+    base={(r["function"],r["words"]):r for r in baseline["results"]}; flagged=[]
+    for r in current["results"]:
+        b=base.get((r["function"],r["words"]))
+        if not b: continue
+        for k in ("seconds","peak_mb"):
+            if b[k] and r[k]>b[k]*(1+threshold):
+                flagged.append({"function":r["function"],"words":r["words"],"metric":k,
+                                "baseline":b[k],"current":r[k],"change":round(r[k]/b[k]-1,3)})
+    return flagged
+
+def main():
+    ap=argparse.ArgumentParser(description="Time plush_utils functions over synthetic manuscripts")
+    ap.add_argument("--sizes",default="1000,10000,100000,1000000",help="comma-separated word counts")
+    ap.add_argument("--functions",default=",".join(FUNCS))
+    ap.add_argument("--repeat",type=int,default=3,help="timed runs per case; the best is kept")
+    ap.add_argument("--seed",type=int,default=0)
+    for k,v in (("dialogue",0.15),("cliches",0.02),("fillers",0.25),("passive",0.1),("long",0.05)):
+        ap.add_argument(f"--{k}",type=float,default=v)
+    ap.add_argument("-o","--out",help="write results JSON here")
+    ap.add_argument("--baseline",help="results JSON from an earlier run to compare against")
+    ap.add_argument("--threshold",type=float,default=0.2,help="allowed slowdown/growth before flagging (default 0.2)")
+    a=ap.parse_args()
+    funcs=[f for f in a.functions.split(",") if f]
+    unknown=set(funcs)-set(FUNCS)
+    if unknown: ap.error(f"unknown functions: {', '.join(sorted(unknown))}")
+    rates={k:getattr(a,k) for k in ("dialogue","cliches","fillers","passive","long")}
+    res=run([int(s) for s in a.sizes.split(",")],funcs,a.repeat,a.seed,rates)
+    if a.out:
+        with open(a.out,"w") as f: json.dump(res,f,indent=2)
+    if a.baseline:
+        with open(a.baseline) as f: flagged=compare(res,json.load(f),a.threshold)
+        for x in flagged:
+            print(f"REGRESSION {x['function']} @ {x['words']} words: {x['metric']} "
+                  f"{x['baseline']} -> {x['current']} (+{x['change']:.0%})")
+        if flagged: sys.exit(1)
+        print(f"no regressions above {a.threshold:.0%}")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,130 @@
+import hashlib, os, pickle, threading
+from collections import OrderedDict
+
+# Part of every key: bump it whenever analyzer output or report formatting changes, so a
+# PLUSH_CACHE_DIR written by an older release is ignored instead of served.
+CACHE_VERSION = 1
+# runtime differences that change results, e.g. a missing NLTK model replaced by a fallback
+_key_tags=()
+
+def set_key_tags(*tags):
+    global _key_tags
+    _key_tags=tags
+
+def text_key(tool, txt, *params):
+    h=hashlib.sha256(txt.encode("utf-8","surrogatepass"))
+    h.update(b"\0"+tool.encode()+b"\0"+repr(params).encode()+b"\0"+str(CACHE_VERSION).encode())
+    if _key_tags: h.update(b"\0"+"\0".join(_key_tags).encode())
+    return h.hexdigest()
+
+def _size(v):
+    if isinstance(v,(str,bytes)): return len(v)
+    return len(pickle.dumps(v,pickle.HIGHEST_PROTOCOL))
+
+class ResultCache:
+    def __init__(self, max_items=512, max_bytes=128<<20, disk_dir=None, disk_max_bytes=1<<30):
+        self.max_items=max_items; self.max_bytes=max_bytes
+        self.disk_dir=disk_dir; self.disk_max_bytes=disk_max_bytes
+        self._mem=OrderedDict(); self._bytes=0; self._lock=threading.Lock()
+        self.hits=self.misses=self.disk_hits=self.evictions=0
+        self._disk_bytes=0
+        if disk_dir:
+            os.makedirs(disk_dir,exist_ok=True)
+            self._disk_bytes=sum(os.path.getsize(p) for p in self._disk_files())
+
+    # ── memory tier ──────────────────────────────────────────
+    def _store(self, key, value, size):
+        old=self._mem.pop(key,None)
+        if old: self._bytes-=old[1]
+        if size>self.max_bytes: return
+        self._mem[key]=(value,size); self._bytes+=size
+        while len(self._mem)>self.max_items or self._bytes>self.max_bytes:
+            _,(_,sz)=self._mem.popitem(last=False)
+            self._bytes-=sz; self.evictions+=1
+
+    # ── disk tier ────────────────────────────────────────────
+    def _path(self, key): return os.path.join(self.disk_dir,key[:2],key+".pkl")
+
+    def _disk_files(self):
+        for root,_,files in os.walk(self.disk_dir):
+            for f in files:
+                if f.endswith(".pkl"): yield os.path.join(root,f)
+
+    def _disk_get(self, key):
+        try:
+            with open(self._path(key),"rb") as f: return pickle.load(f)
+        except (OSError,EOFError,pickle.UnpicklingError): return None
+
+    def _disk_put(self, key, value):
+        p=self._path(key); os.makedirs(os.path.dirname(p),exist_ok=True)
+        data=pickle.dumps(value,pickle.HIGHEST_PROTOCOL); tmp=f"{p}.{os.getpid()}.tmp"
+        with open(tmp,"wb") as f: f.write(data)
+        os.replace(tmp,p); self._disk_bytes+=len(data)
+        if self._disk_bytes>self.disk_max_bytes: self._prune_disk()
+
+    def _prune_disk(self):
+        files=sorted(((os.path.getmtime(p),os.path.getsize(p),p) for p in self._disk_files()))
+        total=sum(sz for _,sz,_ in files); target=self.disk_max_bytes*0.9
+        for _,sz,p in files:
+            if total<=target: break
+            try: os.remove(p); total-=sz
+            except OSError: pass
+        self._disk_bytes=total
+
+    # ── public API ───────────────────────────────────────────
+    def get(self, key, default=None):
+        with self._lock:
+            hit=self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key); self.hits+=1; return hit[0]
+        if self.disk_dir:
+            v=self._disk_get(key)
+            if v is not None:
+                with self._lock:
+                    self._store(key,v,_size(v)); self.hits+=1; self.disk_hits+=1
+                return v
+        with self._lock: self.misses+=1
+        return default
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._mem: return True
+        return bool(self.disk_dir) and os.path.exists(self._path(key))
+
+    def put(self, key, value):
+        size=_size(value)
+        with self._lock: self._store(key,value,size)
+        if self.disk_dir: self._disk_put(key,value)
+
+    def cached(self, tool, fn, txt, *params):
+        key=text_key(tool,txt,*params)
+        v=self.get(key)
+        if v is None:
+            # keyed again: computing it may have loaded a fallback that tags the key
+            v=fn(txt,*params); self.put(text_key(tool,txt,*params),v)
+        return v
+
+    def clear(self):
+        with self._lock: self._mem.clear(); self._bytes=0
+
+    def stats(self):
+        with self._lock:
+            total=self.hits+self.misses
+            return {"hits":self.hits,"misses":self.misses,"disk_hits":self.disk_hits,
+                    "hit_rate":self.hits/total if total else 0.0,"items":len(self._mem),
+                    "bytes":self._bytes,"evictions":self.evictions,"disk_bytes":self._disk_bytes}
+
+_default=None
+_default_lock=threading.Lock()
+
+def default_cache():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default=ResultCache(max_items=int(os.environ.get("PLUSH_CACHE_ITEMS",512)),
+                                 max_bytes=int(os.environ.get("PLUSH_CACHE_MB",128))<<20,
+                                 disk_dir=os.environ.get("PLUSH_CACHE_DIR") or None,
+                                 disk_max_bytes=int(os.environ.get("PLUSH_CACHE_DISK_MB",1024))<<20)
+        return _default
+
+def cached(tool, fn, txt, *params): return default_cache().cached(tool,fn,txt,*params)
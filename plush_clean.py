@@ -0,0 +1,115 @@
+import re
+
+# Text normalization in one pass per chunk. A single character class finds every position that
+# may change (mapped characters, the first character of each multi-character sequence, quotes,
+# non-space whitespace); text in between is copied through untouched. Works on a chunk stream,
+# holding back only what the next chunk could still extend (a sequence or a whitespace run).
+SMART_QUOTES = object()  # marker rule: straight quotes become curly, by context
+
+RULES = {
+    "quotes":      {"“":'"',"”":'"',"„":'"',"‟":'"',"‘":"'","’":"'","‚":"'","‛":"'"},
+    "smart_quotes": SMART_QUOTES,
+    "dashes":      {"--":"—"},
+    "ascii_dashes": {"—":"--","–":"-"},
+    "ellipsis":    {"...":"…"},
+    "ascii_ellipsis": {"…":"..."},
+    "spaces":      {"\u00a0":" ","\u2007":" ","\u2009":" ","\u200a":" ","\u202f":" ","\u3000":" ","\t":" "},
+    "invisible":   {"\u200b":"","\u200c":"","\u2060":"","\ufeff":"","\u00ad":""},
+}
+DEFAULT_RULES = ("quotes","dashes","spaces","invisible")
+
+_OPENERS = frozenset(" \n([{<—–-\"'“‘")
+_SPACES = re.compile(r" {2,}")
+
+def add_rule(name, mapping):
+    # mapping: {source: replacement}; sources may be single characters or sequences like "--"
+    RULES[name]=dict(mapping); return name
+
+class Normalizer:
+    def __init__(self, rules=DEFAULT_RULES, preserve_paragraphs=False, collapse_whitespace=True):
+        self.rules=tuple(rules); self.preserve_paragraphs=preserve_paragraphs
+        self.collapse_whitespace=collapse_whitespace
+        self.chars={}; self.seqs={}; self.smart=False
+        for r in self.rules:
+            m=RULES[r] if isinstance(r,str) else r
+            if m is SMART_QUOTES: self.smart=True; continue
+            for k,v in m.items(): (self.chars if len(k)==1 else self.seqs)[k]=v
+        # sequences by first character, longest first
+        self.by_first={}
+        for q in sorted(self.seqs,key=len,reverse=True): self.by_first.setdefault(q[0],[]).append(q)
+        trigger=set(self.chars)|set(self.by_first)
+        if self.smart: trigger|={'"',"'"}
+        cls="".join(map(re.escape,sorted(trigger)))
+        if collapse_whitespace: cls+=r"\t\n\r\f\v\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\x1c-\x1f\x85"
+        self.scan=re.compile(f"[{cls}]") if cls else None
+        self.hold=max(max(map(len,self.seqs),default=1)-1,1)
+        # deleted characters (zero-width spaces, BOMs) are absorbed into whitespace runs
+        self.deleted=frozenset(k for k,v in self.chars.items() if not v) if collapse_whitespace else frozenset()
+        self.run=re.compile("[\\s"+"".join(map(re.escape,sorted(self.deleted)))+"]*")
+
+    def _ws(self, s): return "\n\n" if self.preserve_paragraphs and s.count("\n")>=2 else " "
+
+    def _lit(self, s): return _SPACES.sub(" ",s) if self.collapse_whitespace and "  " in s else s
+
+    def _step(self, buf, prev, final):
+        # returns (normalized text, unprocessed rest, last character emitted)
+        n=len(buf); cut=n if final else n-self.hold
+        if not final and self.collapse_whitespace:
+            # the next chunk may continue a trailing whitespace run
+            while cut>0 and (buf[cut-1]==" " or buf[cut-1] in self.deleted): cut-=1
+        if cut<=0: return "",buf,prev
+        out=[]; pos=0; chars=self.chars; ws=self.collapse_whitespace
+        for m in (self.scan.finditer(buf,0,cut) if self.scan else ()):
+            s=m.start()
+            if s<pos: continue
+            c=m.group(); lit=buf[pos:s]
+            if ws and (c.isspace() or c in self.deleted):
+                e=self.run.match(buf,s+1).end()
+                if e==n and not final: cut=s; break
+                run=buf[s:e]
+                if run.strip("".join(self.deleted)): lit=lit.rstrip(" "); r=self._ws(run)
+                else: r=""  # only deleted characters
+            else:
+                r=None
+                for q in self.by_first.get(c,()):
+                    if buf.startswith(q,s): r=self.seqs[q]; e=s+len(q); break
+                if r is None:
+                    r=chars.get(c,c); e=s+1
+                    if self.smart and r in ("\"","'"):
+                        before=lit[-1] if lit else prev
+                        opening=not before or before in _OPENERS
+                        r=("“" if opening else "”") if r=='"' else ("‘" if opening else "’")
+                    elif r==c: continue
+            if lit: out.append(self._lit(lit)); prev=lit[-1]
+            if r: out.append(r); prev=r[-1]
+            pos=e
+        if not final and self.collapse_whitespace:
+            while cut>pos and (buf[cut-1]==" " or buf[cut-1] in self.deleted): cut-=1
+        if cut>pos:
+            lit=buf[pos:cut]; out.append(self._lit(lit)); prev=lit[-1]
+        return "".join(out),buf[max(cut,pos):],prev
+
+    def stream(self, chunks):
+        buf=""; prev=""; started=False
+        for c in chunks:
+            buf+=c
+            out,buf,prev=self._step(buf,prev,False)
+            if not started and self.collapse_whitespace: out=out.lstrip()
+            if out: started=True; yield out
+        out,_,_=self._step(buf,prev,True)
+        if self.collapse_whitespace:
+            out=out.rstrip()
+            if not started: out=out.lstrip()
+        if out: yield out
+
+    def normalize(self, txt): return "".join(self.stream((txt,)))
+
+    __call__=normalize
+
+_cache={}
+
+def normalizer(rules=DEFAULT_RULES, preserve_paragraphs=False):
+    key=(tuple(rules),preserve_paragraphs)
+    n=_cache.get(key)
+    if n is None: n=_cache[key]=Normalizer(rules,preserve_paragraphs)
+    return n
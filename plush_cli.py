@@ -0,0 +1,104 @@
+import argparse, glob, hashlib, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from plush_utils import STYLE_PRESETS, format_full_report
+from plush_io import analyze_source
+
+EXTS = (".txt", ".docx", ".rtf")
+MANIFEST = ".plush_manifest.jsonl"
+
+def _inside(path, root): return root is not None and os.path.commonpath([os.path.realpath(path),root])==root
+
+def iter_inputs(specs, recursive=True, exclude=None):
+    # `exclude` (the output directory) is never read, so `plush_cli . -f txt` skips its own reports
+    seen=set(); exclude=exclude and os.path.realpath(exclude)
+    for spec in specs:
+        if os.path.isdir(spec):
+            walk=os.walk(spec) if recursive else [(spec,[],os.listdir(spec))]
+            paths=(os.path.join(r,f) for r,_,fs in walk if not _inside(r,exclude) for f in sorted(fs))
+        else:
+            paths=sorted(glob.glob(spec,recursive=True))
+        for p in paths:
+            if p.lower().endswith(EXTS) and os.path.isfile(p) and p not in seen and not _inside(p,exclude):
+                seen.add(p); yield p
+
+def file_hash(path):
+    h=hashlib.sha256()
+    with open(path,"rb") as f:
+        for block in iter(lambda: f.read(1<<20),b""): h.update(block)
+    return h.hexdigest()
+
+def process(path, digest, out_dir, fmt, style):
+    t0=time.perf_counter()
+    a=analyze_source(path,full=True)
+    tag="" if style=="None" else f"-{style.lower()}"
+    name=f"{os.path.splitext(os.path.basename(path))[0]}-{digest[:12]}{tag}.{fmt}"
+    dest=os.path.join(out_dir,name); tmp=dest+".tmp"
+    with open(tmp,"w",encoding="utf-8") as f:
+        if fmt=="json": json.dump({"source":path,"sha256":digest,"style":style,"analysis":a.to_dict()},f,ensure_ascii=False)
+        else: f.write(format_full_report(a,style))
+    os.replace(tmp,dest)
+    return {"source":path,"sha256":digest,"format":fmt,"style":style,"report":name,"words":a.words,
+            "bytes":os.path.getsize(path),"seconds":round(time.perf_counter()-t0,4)}
+
+def load_manifest(out_dir):
+    # keyed on (sha256, format, style): a report in another format or style is not a resume hit
+    done={}
+    try:
+        with open(os.path.join(out_dir,MANIFEST),encoding="utf-8") as f:
+            for L in f:
+                try: r=json.loads(L)
+                except ValueError: continue
+                if os.path.exists(os.path.join(out_dir,r["report"])): done[(r["sha256"],r.get("format"),r.get("style"))]=r
+    except FileNotFoundError: pass
+    return done
+
+def run(specs, out_dir, fmt="json", style="None", jobs=None, resume=True, recursive=True, log=sys.stderr):
+    os.makedirs(out_dir,exist_ok=True)
+    done=load_manifest(out_dir) if resume else {}
+    jobs=jobs or os.cpu_count() or 1
+    stats={"processed":0,"skipped":0,"failed":0,"bytes":0,"words":0}
+    t0=time.perf_counter()
+    with open(os.path.join(out_dir,MANIFEST),"a",encoding="utf-8") as manifest, \
+         ProcessPoolExecutor(max_workers=jobs) as ex:
+        pending={}
+        def drain():
+            finished,_=wait(pending,return_when=FIRST_COMPLETED)
+            for fut in finished:
+                path=pending.pop(fut)
+                try: r=fut.result()
+                except Exception as e:
+                    stats["failed"]+=1; print(f"FAILED {path}: {e}",file=log); continue
+                stats["processed"]+=1; stats["bytes"]+=r["bytes"]; stats["words"]+=r["words"]
+                manifest.write(json.dumps(r,ensure_ascii=False)+"\n"); manifest.flush()
+                print(f"ok {path} -> {r['report']} ({r['seconds']:.2f}s)",file=log)
+        for path in iter_inputs(specs,recursive,out_dir):
+            digest=file_hash(path); key=(digest,fmt,style)
+            if key in done:
+                stats["skipped"]+=1; continue
+            done[key]={"source":path}  # identical files queued in the same run are processed once
+            # keep at most 2x jobs files in flight so huge directories stream instead of queueing up front
+            while len(pending)>=2*jobs: drain()
+            pending[ex.submit(process,path,digest,out_dir,fmt,style)]=path
+        while pending: drain()
+    dt=time.perf_counter()-t0
+    stats.update(seconds=round(dt,3),files_per_sec=round(stats["processed"]/dt,2) if dt else 0.0,
+                 words_per_sec=round(stats["words"]/dt) if dt else 0,mb_per_sec=round(stats["bytes"]/dt/1e6,3) if dt else 0.0)
+    return stats
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(prog="plush_cli",description="Batch full reports for .txt/.docx/.rtf manuscripts")
+    ap.add_argument("inputs",nargs="+",help="files, directories or glob patterns")
+    ap.add_argument("-o","--out",default="plush_reports",help="output directory (default: plush_reports)")
+    ap.add_argument("-f","--format",choices=["json","txt"],default="json")
+    ap.add_argument("-s","--style",choices=list(STYLE_PRESETS),default="None")
+    ap.add_argument("-j","--jobs",type=int,default=None,help="worker processes (default: CPU count)")
+    ap.add_argument("--no-resume",dest="resume",action="store_false",help="reprocess files already in the manifest")
+    ap.add_argument("--no-recursive",dest="recursive",action="store_false")
+    a=ap.parse_args(argv)
+    s=run(a.inputs,a.out,a.format,a.style,a.jobs,a.resume,a.recursive)
+    print(f"{s['processed']} processed, {s['skipped']} skipped, {s['failed']} failed in {s['seconds']}s "
+          f"| {s['files_per_sec']} files/s, {s['words_per_sec']} words/s, {s['mb_per_sec']} MB/s")
+    return 1 if s["failed"] else 0
+
+if __name__=="__main__":
+    sys.exit(main())
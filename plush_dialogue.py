@@ -0,0 +1,120 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+# One pass over the quotes of a text: each quote is attributed from the words after it
+# ("…," said Mara / "…," Captain Reyes said / "…," she asked) or, failing that, the words before
+# it (Mara said, "…"). A run of capitalized words is one name. Verbs, pronouns and names are set
+# lookups, not regex alternations.
+SPEECH_VERBS = frozenset("""said says say asked asks ask replied replies reply answered answers whispered whispers
+shouted shouts yelled yells screamed screams cried cries called calls muttered mutters murmured murmurs mumbled
+mumbles added adds continued continues explained explains snapped snaps growled growls hissed hisses sighed sighs
+laughed laughs exclaimed exclaims demanded demands insisted insists begged begs warned warns told tells repeated
+repeats admitted admits agreed agrees breathed breathes whimpered whimpers sobbed sobs groaned groans gasped gasps
+snarled snarls barked barks shrieked shrieks declared declares announced announces offered offers suggested
+suggests pleaded pleads protested protests countered counters interrupted interrupts conceded concedes
+observed observes noted notes remarked remarks responded responds retorted retorts teased teases joked jokes
+stammered stammers stuttered stutters croaked croaks roared roars bellowed bellows""".split())
+
+PRONOUNS = frozenset("he she they i we you it".split())
+
+# capitalized words that start sentences but are not speakers
+NOT_NAMES = frozenset("""the a an and but or so then now when while if as at in on of to for with from by
+this that these those there here his her their its my your our what who why how where yes no not oh well
+after before again still just only even also maybe perhaps""".split())
+
+QUOTE = re.compile(r'[“"]([^“”"]+)[”"]')
+# up to four words with nothing but spaces between them, right after / right before a quote
+_AFTER = re.compile(r"[\s,—–-]*([A-Za-z][\w'’]*(?:[ \t]+[A-Za-z][\w'’]*){1,3})")
+_BEFORE = re.compile(r"([A-Za-z][\w'’]*(?:[ \t]+[A-Za-z][\w'’]*){1,3})[\s,:—–-]*$")
+MAX_NAME_WORDS = 3
+
+@dataclass(slots=True)
+class Line:
+    start: int
+    end: int
+    text: str
+    speaker: str = None
+
+@dataclass(slots=True)
+class SpeakerStats:
+    lines: int = 0
+    words: int = 0
+    spans: list = field(default_factory=list)
+
+class DialogueEngine:
+    def __init__(self, verbs=SPEECH_VERBS, pronouns=PRONOUNS, not_names=NOT_NAMES, keep_pronouns=True, window=60):
+        self.verbs=set(verbs); self.pronouns=frozenset(pronouns); self.not_names=frozenset(not_names)
+        self.keep_pronouns=keep_pronouns; self.window=window
+
+    def add_verbs(self, *verbs): self.verbs.update(v.lower() for v in verbs); return self
+
+    def _name(self, words):
+        # a pronoun, or a run of capitalized words that is not a verb; a leading opener is dropped
+        # ("The Doctor" -> "Doctor")
+        if not words: return None
+        low=words[0].lower()
+        if low in self.pronouns: return low if len(words)==1 else None
+        while words and words[0].lower() in self.not_names: words=words[1:]
+        if not words or len(words)>MAX_NAME_WORDS: return None
+        if all(w[0].isupper() and w.lower() not in self.verbs for w in words): return " ".join(words)
+        return None
+
+    def _run(self, words):
+        # length of the leading capitalized run (a lone pronoun counts as one)
+        n=0
+        while n<len(words) and words[n][0].isupper() and words[n].lower() not in self.verbs: n+=1
+        return n or (1 if words[0].lower() in self.pronouns else 0)
+
+    def _who_after(self, words):
+        # said Captain Reyes / Captain Reyes said / she asked
+        if words[0].lower() in self.verbs: return self._name(words[1:1+self._run(words[1:])] if len(words)>1 else [])
+        n=self._run(words)
+        return self._name(words[:n]) if 0<n<len(words) and words[n].lower() in self.verbs else None
+
+    def _who_before(self, words):
+        # Captain Reyes said, / said Captain Reyes:
+        if words[-1].lower() in self.verbs:
+            rest=words[:-1]; n=self._run(rest[::-1])
+            return self._name(rest[len(rest)-n:]) if n else None
+        n=self._run(words[::-1])
+        return self._name(words[-n:]) if 0<n<len(words) and words[-n-1].lower() in self.verbs else None
+
+    def lines(self, txt, offset=0):
+        # A tag names the speaker of its own quote only; untagged quotes later in the same paragraph
+        # carry the last speaker over. A pronoun tag ("she replied") usually means a different
+        # speaker, so it is kept as that pronoun (or left unattributed with keep_pronouns=False).
+        out=[]; para_speaker=None; para_end=0; win=self.window; prev=0
+        for m in QUOTE.finditer(txt):
+            s,e=m.span()
+            if para_speaker is not None and "\n" in txt[para_end:s]: para_speaker=None
+            a=_AFTER.match(txt,e,min(len(txt),e+win))
+            who=self._who_after(a.group(1).split()) if a else None
+            if who is None:
+                b=_BEFORE.search(txt,max(prev,s-win),s)
+                who=self._who_before(b.group(1).split()) if b else None
+            if who is None: who=para_speaker
+            elif who in self.pronouns and not self.keep_pronouns: who=None
+            if who is not None: para_speaker=who
+            para_end=prev=e
+            out.append(Line(m.start(1)+offset,m.end(1)+offset,m.group(1),who))
+        return out
+
+def speaker_stats(lines):
+    out={}
+    for h in lines:
+        if h.speaker is None: continue
+        st=out.get(h.speaker)
+        if st is None: st=out[h.speaker]=SpeakerStats()
+        st.lines+=1; st.words+=len(h.text.split()); st.spans.append((h.start,h.end))
+    return out
+
+def speaker_counts(lines):
+    lc=Counter(); wc=Counter()
+    for h in lines:
+        if h.speaker is not None: lc[h.speaker]+=1; wc[h.speaker]+=len(h.text.split())
+    return lc,wc
+
+_default=DialogueEngine()
+
+def default_engine(): return _default
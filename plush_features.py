@@ -0,0 +1,68 @@
+import importlib, re
+from plush_readability import SEGMENT, remove_punctuation, syllables
+
+# Columnar per-sentence features: one NumPy array per feature instead of per-sentence strings,
+# token lists and counters. Sentence text is sliced from the document only when asked for.
+# numpy is imported on first use so importing plush_utils stays cheap.
+INT_COLUMNS = ("start","end","tokens","words","lexicon","syllables","segments","fillers")
+BOOL_COLUMNS = ("passive","was_were")
+
+_WORDPUNCT = re.compile(r"\w+|[^\w\s]+")
+
+def _np(): return importlib.import_module("numpy")
+
+class SentenceTable:
+    __slots__=("text",*INT_COLUMNS,*BOOL_COLUMNS)
+
+    def __init__(self, text, **cols):
+        self.text=text
+        for k in INT_COLUMNS+BOOL_COLUMNS: setattr(self,k,cols[k])
+
+    @classmethod
+    def build(cls, text, lower, spans, fillers=(), word=None, passive_starts=(), was_were=None):
+        # one pass over the sentences; fillers is a set of lowercase words counted with `word`
+        np=_np(); n=len(spans); cols={k:[0]*n for k in INT_COLUMNS}; ww=[False]*n
+        start,end,tok,words,lex,syl,seg,fil=(cols[k] for k in INT_COLUMNS)
+        for i,(a,b) in enumerate(spans):
+            s=text[a:b]; low=lower[a:b]
+            start[i]=a; end[i]=b
+            tok[i]=len(_WORDPUNCT.findall(s)); words[i]=len(s.split())
+            ws=remove_punctuation(low).split(); lex[i]=len(ws); syl[i]=sum(map(syllables,ws))
+            seg[i]=sum(1 for g in SEGMENT.findall(s) if len(remove_punctuation(g).split())>2)
+            if fillers: fil[i]=sum(1 for w in word.findall(low) if w in fillers)
+            if was_were is not None: ww[i]=was_were.search(s) is not None
+        arrays={k:np.array(v,dtype=np.int64 if k in ("start","end") else np.int32) for k,v in cols.items()}
+        arrays["was_were"]=np.array(ww,dtype=bool)
+        arrays["passive"]=np.zeros(n,dtype=bool)
+        if n and len(passive_starts):
+            idx=np.searchsorted(arrays["start"],np.asarray(passive_starts,dtype=np.int64),side="right")-1
+            arrays["passive"][idx[idx>=0]]=True
+        return cls(text,**arrays)
+
+    def __len__(self): return len(self.start)
+
+    def sentence(self, i): return self.text[self.start[i]:self.end[i]]
+
+    def spans(self): return list(zip(self.start.tolist(),self.end.tolist()))
+
+    def long(self, limit=30): return _np().flatnonzero(self.tokens>limit)
+
+    def totals(self):
+        # the counts textstat reports for the whole text
+        return {"words":int(self.words.sum()),"sents":max(1,int(self.segments.sum())),
+                "lexicon":int(self.lexicon.sum()),"syllables":int(self.syllables.sum())}
+
+    def fk_contributions(self):
+        # each sentence's share of the (unrounded) Flesch-Kincaid grade; they sum to the grade
+        np=_np(); t=self.totals(); n=len(self) or 1
+        lex=self.lexicon.astype(np.float64)
+        return 0.39*lex/t["sents"] + (11.8*self.syllables/t["lexicon"] if t["lexicon"] else 0.0) - 15.59/n
+
+    def grades(self):
+        # Flesch-Kincaid grade of each sentence on its own (NaN for sentences without words)
+        np=_np(); lex=self.lexicon.astype(np.float64)
+        with np.errstate(divide="ignore",invalid="ignore"):
+            return np.where(lex>0,0.39*lex+11.8*self.syllables/lex-15.59,np.nan)
+
+    @property
+    def nbytes(self): return sum(getattr(self,k).nbytes for k in INT_COLUMNS+BOOL_COLUMNS)
@@ -0,0 +1,79 @@
+import re, threading, zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from plush_utils import PATTERNS, Analysis, SentenceHit, Span, Line, analyze, merge_analyses
+from plush_parallel import PARALLEL_MIN_CHARS
+
+_PARA = PATTERNS["paragraph"]
+_HAS_WORD = PATTERNS["has_word"]
+_ENDS_SENTENCE = re.compile(r"[.!?…][\"'”’)\]]*\s*$")
+
+def paragraph_spans(txt):
+    out=[]; a=0
+    for m in _PARA.finditer(txt):
+        out.append((a,m.end())); a=m.end()
+    if a<len(txt): out.append((a,len(txt)))
+    return out
+
+def block_spans(txt, paras_per_block=8, max_chars=20000):
+    # Content-defined blocks: a block ends after a paragraph whose checksum hits the boundary
+    # condition, so editing one paragraph only changes the block it lives in. Only paragraphs that
+    # end a sentence can close a block: the tokenizer runs a heading or an unpunctuated line into
+    # the next paragraph, and cutting there would segment differently from the whole text.
+    out=[]; start=None
+    for a,b in paragraph_spans(txt):
+        if start is None: start=a
+        if not _ENDS_SENTENCE.search(txt,a,b): continue
+        if zlib.crc32(txt[a:b].strip().encode("utf-8","surrogatepass"))%paras_per_block==0 or b-start>=max_chars:
+            out.append((start,b)); start=None
+    if start is not None: out.append((start,len(txt)))
+    return out
+
+def shift(a, chars):
+    if not chars: return a
+    s=Analysis(a.words,a.sents,a.lexicon,a.syllables,a.n_sentences,a.chars,a.fillers,a.watch,
+               [SentenceHit(h.index,h.start+chars,h.end+chars,h.text,h.issues) for h in a.long],
+               [SentenceHit(h.index,h.start+chars,h.end+chars,h.text,h.issues) for h in a.passive],
+               [SentenceHit(h.index,h.start+chars,h.end+chars,h.text,h.issues) for h in a.suggestions],
+               a.speakers,a.speaker_words)
+    if a.dialogue is not None: s.dialogue=[Line(h.start+chars,h.end+chars,h.text,h.speaker) for h in a.dialogue]
+    if a.cliches is not None: s.cliches=[Span(h.start+chars,h.end+chars,h.text) for h in a.cliches]
+    return s
+
+def _analyze_block(txt, watchlist, full): return analyze(txt,watchlist,full)
+
+class IncrementalAnalyzer:
+    # Keeps per-block results of earlier versions; re-analysis only touches blocks whose text changed.
+    def __init__(self, watchlist=None, full=False, paras_per_block=8, max_blocks=20000, workers=None):
+        self.watchlist=tuple(watchlist) if watchlist else None; self.full=full
+        self.paras_per_block=paras_per_block; self.max_blocks=max_blocks; self.workers=workers
+        self._blocks=OrderedDict(); self._lock=threading.Lock()
+        self.last={"blocks":0,"reused":0,"analyzed":0,"chars_analyzed":0}
+
+    def analyze(self, txt, progress=None, executor=None):
+        # progress(done, total) counts the blocks that actually need analysis
+        with self._lock: return self._analyze(txt,progress,executor)
+
+    def _analyze(self, txt, progress, executor):
+        spans=[(a,b) for a,b in block_spans(txt,self.paras_per_block) if _HAS_WORD.search(txt,a,b)]
+        blocks=[txt[a:b] for a,b in spans]
+        todo=[b for b in dict.fromkeys(blocks) if b not in self._blocks]
+        changed=sum(map(len,todo))
+        args=(todo,[self.watchlist]*len(todo),[self.full]*len(todo))
+        if progress: progress(0,len(todo))
+        if self.workers!=1 and len(todo)>1 and changed>=PARALLEL_MIN_CHARS and executor is not None:
+            self._store(todo,executor.map(_analyze_block,*args),progress)
+        elif self.workers!=1 and len(todo)>1 and changed>=PARALLEL_MIN_CHARS:
+            with ProcessPoolExecutor(max_workers=self.workers) as ex: self._store(todo,ex.map(_analyze_block,*args),progress)
+        else: self._store(todo,map(_analyze_block,*args),progress)
+        parts=[]
+        for (a,_),b in zip(spans,blocks):
+            self._blocks.move_to_end(b); parts.append(shift(self._blocks[b],a))
+        while len(self._blocks)>self.max_blocks: self._blocks.popitem(last=False)
+        self.last={"blocks":len(blocks),"reused":len(blocks)-len(todo),"analyzed":len(todo),"chars_analyzed":changed}
+        return merge_analyses(parts) if parts else analyze("",self.watchlist,self.full)
+
+    def _store(self, todo, results, progress):
+        for i,(b,r) in enumerate(zip(todo,results),1):
+            self._blocks[b]=r
+            if progress: progress(i,len(todo))
@@ -0,0 +1,94 @@
+import codecs, mmap, os, re
+from collections import deque
+from plush_utils import PATTERNS, DocxDocument, rtf_to_text, analyze, merge_analyses
+from plush_parallel import CHUNK_CHARS
+
+READ_BYTES = 1 << 16
+_PARA = PATTERNS["paragraph"]
+_HAS_WORD = PATTERNS["has_word"]
+
+def _decode(blocks, encoding="utf-8-sig"):
+    # incremental decoding keeps multi-byte characters split across blocks intact
+    dec=codecs.getincrementaldecoder(encoding)(errors="replace")
+    for b in blocks:
+        s=dec.decode(b)
+        if s: yield s
+    s=dec.decode(b"",final=True)
+    if s: yield s
+
+def _file_blocks(f, size):
+    for b in iter(lambda: f.read(size),b""): yield b
+
+def _mmap_blocks(path, size):
+    with open(path,"rb") as f:
+        if os.fstat(f.fileno()).st_size==0: return
+        with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+            for i in range(0,len(mm),size): yield mm[i:i+size]
+
+def iter_text(source, size=READ_BYTES, encoding="utf-8-sig"):
+    if isinstance(source,(str,os.PathLike)): return _decode(_mmap_blocks(source,size),encoding)
+    return _decode(_file_blocks(source,size),encoding)
+
+def iter_docx(source):
+    for i,p in enumerate(DocxDocument(source).paragraphs):
+        yield ("\n"+p.text) if i else p.text
+
+def iter_rtf(source, encoding="utf-8"):
+    # striprtf needs the whole document; the plain text is still handed on paragraph by paragraph
+    if isinstance(source,(str,os.PathLike)):
+        with open(source,encoding=encoding,errors="replace") as f: raw=f.read()
+    else: raw=source.read().decode(encoding,errors="replace")
+    txt=rtf_to_text(raw); del raw
+    yield from (m.group() for m in re.finditer(r"[^\n]*\n|[^\n]+$",txt))
+
+def open_stream(source, name=None):
+    name=name or getattr(source,"name",None) or str(source)
+    ext=os.path.splitext(name)[1].lower()
+    if ext==".docx": return iter_docx(source)
+    if ext==".rtf": return iter_rtf(source)
+    return iter_text(source)
+
+def read_text(source, name=None): return "".join(open_stream(source,name))
+
+def _boundary(buf, target):
+    m=_PARA.search(buf,target)
+    if m: return m.end()
+    if len(buf)>=4*target:
+        # one enormous paragraph: settle for a line or sentence end
+        for sep in ("\n",". "):
+            i=buf.find(sep,target)
+            if i>=0: return i+len(sep)
+        return len(buf)
+    return None
+
+def iter_chunks(stream, target=CHUNK_CHARS):
+    # yields (text, offset) pieces of roughly `target` characters that end on paragraph breaks
+    parts=[]; size=0; off=0
+    for piece in stream:
+        parts.append(piece); size+=len(piece)
+        if size<target: continue
+        buf="".join(parts); parts=[]
+        while (cut:=_boundary(buf,target)) is not None:
+            yield buf[:cut],off; off+=cut; buf=buf[cut:]
+        parts=[buf] if buf else []; size=len(buf)
+    buf="".join(parts)
+    if buf: yield buf,off
+
+def _bounded_map(executor, fn, items, window):
+    pending=deque()
+    for args in items:
+        pending.append(executor.submit(fn,*args))
+        if len(pending)>=window: yield pending.popleft().result()
+    while pending: yield pending.popleft().result()
+
+def _analyze_piece(txt, off, watchlist, full): return analyze(txt,watchlist,full,off)
+
+def analyze_stream(chunks, watchlist=None, full=False, executor=None, window=4):
+    # peak memory is one chunk (or `window` chunks with an executor) plus the findings so far
+    items=((t,o,watchlist,full) for t,o in chunks if _HAS_WORD.search(t))
+    parts=_bounded_map(executor,_analyze_piece,items,window) if executor else (_analyze_piece(*a) for a in items)
+    out=merge_analyses(parts)
+    return out if out.chars else analyze("",watchlist,full)
+
+def analyze_source(source, name=None, watchlist=None, full=False, target=CHUNK_CHARS, executor=None):
+    return analyze_stream(iter_chunks(open_stream(source,name),target),watchlist,full,executor)
@@ -0,0 +1,142 @@
+import multiprocessing, os, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from plush_cache import default_cache, text_key
+from plush_metrics import collect
+
+# Background jobs: a bounded thread pool runs them, identical submissions share one job, and
+# chunked work reports progress so a UI can poll instead of blocking its script run.
+
+class QueueFull(RuntimeError):
+    pass
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    tool: str
+    state: str = "queued"  # queued | running | done | error | cancelled
+    done: int = 0
+    total: int = 0
+    result: object = None
+    error: str = None
+    stages: dict = None
+    submitted: float = field(default_factory=time.time)
+    finished: float = None
+    key: str = None  # result cache key the result was stored under
+    future: object = field(default=None, repr=False)
+
+    @property
+    def ready(self): return self.state in ("done","error","cancelled")
+
+    @property
+    def progress(self):
+        if self.state=="done": return 1.0
+        return self.done/self.total if self.total else 0.0
+
+class JobQueue:
+    def __init__(self, workers=2, max_pending=32, processes=None, keep=256, cache=None):
+        self.workers=workers; self.max_pending=max_pending; self.processes=processes; self.keep=keep
+        self.cache=cache if cache is not None else default_cache()
+        self._threads=ThreadPoolExecutor(max_workers=workers,thread_name_prefix="plush-job")
+        self._procs=None; self._lock=threading.Lock(); self._jobs=OrderedDict()
+
+    def executor(self):
+        # one process pool shared by all jobs, so concurrent reports can't oversubscribe the host;
+        # workers start from a clean server process, since forking a threaded web server can copy
+        # locks held by other threads
+        with self._lock:
+            if self._procs is None:
+                ctx=multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+                self._procs=ProcessPoolExecutor(max_workers=self.processes,mp_context=ctx)
+            return self._procs
+
+    def submit(self, tool, fn, txt, *params):
+        # fn(txt, *params, progress=callback); returns the Job, which may already be done (cache hit)
+        # or be shared with an identical submission that is still in flight. The cache lookup (maybe a
+        # disk read) runs outside the lock; the in-flight check is repeated before inserting, so two
+        # identical submissions still can't both start a job.
+        key=text_key(tool,txt,*params)
+        with self._lock:
+            job=self._live(key)
+            if job is not None: return job
+        hit=self.cache.get(key)
+        with self._lock:
+            job=self._live(key)
+            if job is not None: return job
+            if hit is not None:
+                job=self._jobs[key]=Job(key,tool,"done",1,1,hit,finished=time.time(),key=key)
+            else:
+                if sum(not j.ready for j in self._jobs.values())>=self.max_pending:
+                    raise QueueFull(f"{self.max_pending} jobs already pending")
+                job=self._jobs[key]=Job(key,tool)
+                job.future=self._threads.submit(self._run,job,fn,txt,params)
+            self._prune()
+        return job
+
+    def _live(self, key):
+        # the queued, running or finished job for this key, if any; called with the lock held
+        job=self._jobs.get(key)
+        if job is None or job.state in ("error","cancelled"): return None
+        self._jobs.move_to_end(key); return job
+
+    def result(self, job):
+        # A finished job's result. Once the cache holds it, the job lets go of its own copy, so
+        # `keep` finished jobs don't pin results outside the cache's size limit; later callers
+        # sharing the job read it back from the cache.
+        r=job.result
+        if r is None and job.state=="done" and job.key: r=self.cache.get(job.key)
+        elif r is not None and job.key in self.cache: job.result=None
+        return r
+
+    def _run(self, job, fn, txt, params):
+        def progress(done, total): job.done=done; job.total=total
+        job.state="running"
+        try:
+            with collect() as m: result=fn(txt,*params,progress=progress)
+            job.key=text_key(job.tool,txt,*params); self.cache.put(job.key,result)
+            job.result=result; job.state="done"
+        except Exception as e:
+            job.error=f"{type(e).__name__}: {e}"; job.state="error"
+        finally:
+            job.stages=m.snapshot() if job.state=="done" else None
+            job.finished=time.time(); job.future=None
+
+    def _prune(self):
+        extra=len(self._jobs)-self.keep
+        for k in [k for k,j in self._jobs.items() if j.ready][:max(extra,0)]: del self._jobs[k]
+
+    def get(self, job_id):
+        with self._lock: return self._jobs.get(job_id)
+
+    def wait(self, job_id, timeout=None):
+        job=self.get(job_id); f=job.future if job else None
+        if f is not None: f.exception(timeout)
+        return job
+
+    def cancel(self, job_id):
+        # only jobs that have not started can be cancelled
+        job=self.get(job_id)
+        if job is None or job.future is None or not job.future.cancel(): return False
+        job.state="cancelled"; job.finished=time.time(); return True
+
+    def stats(self):
+        with self._lock:
+            states=[j.state for j in self._jobs.values()]
+        return {s:states.count(s) for s in ("queued","running","done","error","cancelled")}
+
+    def shutdown(self, wait=True):
+        self._threads.shutdown(wait=wait)
+        if self._procs is not None: self._procs.shutdown(wait=wait)
+
+_default=None
+_default_lock=threading.Lock()
+
+def default_queue():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default=JobQueue(workers=int(os.environ.get("PLUSH_JOB_WORKERS",2)),
+                              max_pending=int(os.environ.get("PLUSH_JOB_PENDING",32)),
+                              processes=int(os.environ.get("PLUSH_JOB_PROCESSES",0)) or None)
+        return _default
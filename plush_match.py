@@ -0,0 +1,92 @@
+import gzip, re, threading
+from collections import Counter, deque
+
+_TOKEN=re.compile(r"\w+(?:['’-]\w+)*|[^\w\s]")
+
+def tokens(txt): return [m.group() for m in _TOKEN.finditer(txt.lower())]
+
+def load_phrases(path):
+    opener=gzip.open if path.endswith(".gz") else open
+    with opener(path,"rt",encoding="utf-8") as f:
+        for L in f:
+            L=L.strip()
+            if L and not L.startswith("#"): yield L
+
+class PhraseMatcher:
+    # Aho–Corasick over word tokens: one pass over the text finds every phrase, on word boundaries.
+    def __init__(self, phrases=()):
+        self.vocab={}; self.goto=[{}]; self.fail=[0]; self.term=[()]; self.out=[()]
+        self.phrases=[]; self.lens=[]; self._seen={}; self.maxlen=1
+        self._built=True; self._lock=threading.Lock()
+        for p in phrases: self.add(p)
+
+    def __len__(self): return len(self.phrases)
+
+    def _wid(self, w):
+        wid=self.vocab.get(w)
+        if wid is None:
+            wid=self.vocab[w]=len(self.vocab)
+            if "'" in w or "’" in w:
+                self.vocab.setdefault(w.replace("'","’"),wid); self.vocab.setdefault(w.replace("’","'"),wid)
+        return wid
+
+    def add(self, phrase):
+        words=tokens(phrase)
+        key=" ".join(words).replace("’","'")
+        if not words or key in self._seen: return self._seen.get(key)
+        s=0
+        for w in words:
+            wid=self._wid(w); nxt=self.goto[s].get(wid)
+            if nxt is None:
+                nxt=self.goto[s][wid]=len(self.goto)
+                self.goto.append({}); self.fail.append(0); self.term.append(())
+            s=nxt
+        idx=len(self.phrases); self.phrases.append(phrase); self.lens.append(len(words))
+        self._seen[key]=idx; self.term[s]=self.term[s]+(idx,)
+        self.maxlen=max(self.maxlen,len(words)); self._built=False
+        return idx
+
+    def build(self):
+        with self._lock:
+            if self._built: return self
+            goto,fail=self.goto,self.fail; out=list(self.term)
+            q=deque()
+            for s in goto[0].values(): fail[s]=0; q.append(s)
+            while q:
+                r=q.popleft()
+                for a,s in goto[r].items():
+                    q.append(s); f=fail[r]
+                    while f and a not in goto[f]: f=fail[f]
+                    fail[s]=goto[f].get(a,0)
+                    if out[fail[s]]: out[s]=out[s]+out[fail[s]]
+            self.out=out; self._built=True
+        return self
+
+    def _scan(self, txt, lowered):
+        # every match, overlapping ones included, in order of their end
+        if not self._built: self.build()
+        vocab,goto,fail,out,lens=self.vocab,self.goto,self.fail,self.out,self.lens
+        starts=deque(maxlen=self.maxlen); s=0
+        for m in _TOKEN.finditer(txt if lowered else txt.lower()):
+            starts.append(m.start())
+            wid=vocab.get(m.group())
+            if wid is None: s=0; continue
+            while s and wid not in goto[s]: s=fail[s]
+            s=goto[s].get(wid,0)
+            for idx in out[s]:
+                yield starts[-lens[idx]],m.end(),idx
+
+    def finditer(self, txt, lowered=False, overlapping=False):
+        # leftmost-longest and non-overlapping by default, so "the calm before the storm" is one
+        # hit rather than also counting the "calm before the storm" inside it
+        if overlapping: yield from self._scan(txt,lowered); return
+        end=-1
+        for a,b,i in sorted(self._scan(txt,lowered),key=lambda h:(h[0],-h[1])):
+            if a>=end: end=b; yield a,b,i
+
+    def findall(self, txt, lowered=False, overlapping=False):
+        return [(a,b,self.phrases[i]) for a,b,i in self.finditer(txt,lowered,overlapping)]
+
+    def counts(self, txt, lowered=False, overlapping=False):
+        c=Counter(i for _,_,i in self.finditer(txt,lowered,overlapping))
+        return {self.phrases[i]:n for i,n in c.items()}
@@ -0,0 +1,112 @@
+import atexit, json, os, threading, time
+from contextvars import ContextVar
+from functools import wraps
+
+# Per-stage timers and counters. Stages are inclusive: an outer stage's time contains its inner stages.
+ENABLED = os.environ.get("PLUSH_METRICS", "1") != "0"
+_collectors = ContextVar("plush_collectors", default=())
+
+class Metrics:
+    def __init__(self, clock=time.perf_counter):
+        self.clock=clock; self._lock=threading.Lock(); self.hooks=[]
+        self.stages={}; self.counters={}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            s=self.stages.get(name)
+            if s is None: self.stages[name]=[1,seconds,seconds]
+            else: s[0]+=1; s[1]+=seconds; s[2]=max(s[2],seconds)
+        for h in self.hooks: h(name,seconds)
+
+    def count(self, name, n=1):
+        with self._lock: self.counters[name]=self.counters.get(name,0)+n
+
+    def add_hook(self, fn):
+        # fn(stage, seconds) is called after every observation, e.g. to forward to another backend
+        self.hooks.append(fn); return fn
+
+    def reset(self):
+        with self._lock: self.stages.clear(); self.counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {"stages":{k:{"calls":c,"seconds":t,"max":m} for k,(c,t,m) in self.stages.items()},
+                    "counters":dict(self.counters)}
+
+    def to_json(self): return json.dumps({"time":time.time(),"pid":os.getpid(),**self.snapshot()})
+
+    def write_json(self, path):
+        # one JSON object per line, so a long-running process can append snapshots
+        with open(path,"a",encoding="utf-8") as f: f.write(self.to_json()+"\n")
+
+    def prometheus(self, prefix="plush"):
+        snap=self.snapshot(); out=[]
+        if snap["stages"]:
+            out+=[f"# HELP {prefix}_stage_seconds Time spent per processing stage.",f"# TYPE {prefix}_stage_seconds summary"]
+            for k,s in sorted(snap["stages"].items()):
+                out+=[f'{prefix}_stage_seconds_sum{{stage="{k}"}} {s["seconds"]:.6f}',
+                      f'{prefix}_stage_seconds_count{{stage="{k}"}} {s["calls"]}']
+            out+=[f"# TYPE {prefix}_stage_seconds_max gauge"]
+            out+=[f'{prefix}_stage_seconds_max{{stage="{k}"}} {s["max"]:.6f}' for k,s in sorted(snap["stages"].items())]
+        for k,v in sorted(snap["counters"].items()):
+            out+=[f"# TYPE {prefix}_{k}_total counter",f"{prefix}_{k}_total {v}"]
+        return "\n".join(out)+"\n"
+
+_registry=Metrics()
+
+def registry(): return _registry
+
+def count(name, n=1):
+    if not ENABLED: return
+    _registry.count(name,n)
+    for m in _collectors.get(): m.count(name,n)
+
+class stage:
+    # `with stage("tokenize"): ...` or `@stage("tokenize")`
+    __slots__=("name","t0")
+    def __init__(self, name): self.name=name; self.t0=None
+    def __enter__(self):
+        if ENABLED: self.t0=_registry.clock()
+        return self
+    def __exit__(self, *exc):
+        if self.t0 is None: return False
+        dt=_registry.clock()-self.t0; self.t0=None
+        _registry.observe(self.name,dt)
+        for m in _collectors.get(): m.observe(self.name,dt)
+        return False
+    def __call__(self, fn):
+        name=self.name
+        @wraps(fn)
+        def wrapper(*a, **k):
+            with stage(name): return fn(*a,**k)
+        return wrapper
+
+class collect:
+    # Scoped breakdown: `with collect() as m: ...` records this block's stages into m as well as globally.
+    def __init__(self): self.metrics=Metrics(); self._token=None
+    def __enter__(self):
+        self._token=_collectors.set(_collectors.get()+(self.metrics,)); return self.metrics
+    def __exit__(self, *exc): _collectors.reset(self._token); return False
+
+def snapshot(): return _registry.snapshot()
+
+def prometheus_text(prefix="plush"): return _registry.prometheus(prefix)
+
+def write_json(path): _registry.write_json(path)
+
+def serve(port=9464, host="127.0.0.1"):
+    # Prometheus scrape endpoint on a daemon thread; GET /metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/","/metrics"): self.send_error(404); return
+            body=prometheus_text().encode()
+            self.send_response(200); self.send_header("Content-Type","text/plain; version=0.0.4")
+            self.send_header("Content-Length",str(len(body))); self.end_headers(); self.wfile.write(body)
+        def log_message(self, *a): pass
+    srv=ThreadingHTTPServer((host,port),Handler)
+    threading.Thread(target=srv.serve_forever,daemon=True,name="plush-metrics").start()
+    return srv
+
+if os.environ.get("PLUSH_METRICS_LOG"):
+    atexit.register(lambda: _registry.write_json(os.environ["PLUSH_METRICS_LOG"]))
@@ -0,0 +1,163 @@
+import argparse, csv, json, os, random, re, sys, threading
+
+# Character names from a grouped TSV (data/names.tsv): one line per kind/gender/rarity/origin
+# group. Names are stored once in flat columns with an id set per filter value; a filtered pool
+# is the intersection of those sets, cached, and samples are drawn from it without replacement.
+# Full names sample from the first x last product, so thousands of unique pairs are available.
+NAMES_FILE = os.environ.get("PLUSH_NAMES_FILE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "names.tsv")
+FIELDS = ("gender","rarity","origin","initial","syllables")
+GENDERS = {"any":None,"male":"m","female":"f","unisex":"u","m":"m","f":"f","u":"u"}
+FORMATS = ("txt","csv","jsonl")
+
+_VOWELS = re.compile(r"[aeiouy]+")
+_HIATUS = re.compile(r"ia|io|ua")
+_SILENT = re.compile(r"[aeiouy](?:[^aeiouy]|ll|th|ch|ng|nc|rg|dg|ss)e$|[aeiouy][^aeiouylsxzcg]es$")
+
+def name_syllables(name):
+    # vowel groups, counting split pairs (Sophia, Joshua) twice and dropping a silent final e;
+    # pyphen's hyphenation points undercount short proper names
+    w=name.lower()
+    n=sum(1+len(_HIATUS.findall(g)) for g in _VOWELS.findall(w))
+    if n>1 and _SILENT.search(w): n-=1
+    return max(n,1)
+
+class NameDB:
+    def __init__(self):
+        self.names=[]; self.kind=[]; self.gender=[]; self.rarity=[]; self.origins=[]; self.syllables=[]
+        self._ids={}; self._index={}; self._pools={}; self._lock=threading.Lock()
+
+    @classmethod
+    def load(cls, path=NAMES_FILE):
+        db=cls()
+        with open(path,encoding="utf-8") as f:
+            for n,line in enumerate(f,1):
+                if not line.strip() or line.startswith("#"): continue
+                parts=line.rstrip("\n").split("\t")
+                if len(parts)!=5: raise ValueError(f"{path}:{n}: expected 5 tab-separated columns")
+                kind,gender,rarity,origin,names=parts
+                db.add(names.split(),kind,gender,rarity,origin)
+        return db
+
+    def _put(self, field, value, i): self._index.setdefault((field,value),set()).add(i)
+
+    def add(self, names, kind="first", gender="-", rarity="common", origin=None):
+        # a name listed again (another origin, the other gender) gains that origin/gender
+        with self._lock:
+            for name in names:
+                i=self._ids.get((kind,name))
+                if i is None:
+                    i=self._ids[(kind,name)]=len(self.names)
+                    s=name_syllables(name)
+                    self.names.append(name); self.kind.append(kind); self.gender.append("")
+                    self.rarity.append(rarity); self.origins.append(()); self.syllables.append(s)
+                    for k,v in (("kind",kind),("rarity",rarity),("initial",name[0].upper()),("syllables",s)): self._put(k,v,i)
+                if gender!="-" and gender not in self.gender[i]: self.gender[i]+=gender; self._put("gender",gender,i)
+                if origin and origin not in self.origins[i]: self.origins[i]+=(origin,); self._put("origin",origin,i)
+            self._pools.clear()
+        return self
+
+    def values(self, field, kind="first"):
+        ids=self._index.get(("kind",kind),set())
+        return sorted({v for (f,v),s in self._index.items() if f==field and not s.isdisjoint(ids)})
+
+    def _wanted(self, field, value):
+        # filter value -> the index keys it accepts; None means no filter
+        vals=(value,) if isinstance(value,(str,int)) else tuple(value)
+        if field=="gender":
+            vals=[GENDERS.get(str(v).lower(),v) for v in vals]
+            if None in vals: return None
+            return {*vals,"u"}  # unisex names suit either
+        if field=="initial": return {str(v).upper()[:1] for v in vals}
+        if field=="syllables": return {int(v) for v in vals}
+        vals={str(v).lower() for v in vals}
+        return None if "any" in vals else vals
+
+    def pool(self, kind="first", **filters):
+        # sorted ids matching every filter; each filter is a value or a collection of values
+        for k in filters:
+            if k not in FIELDS: raise ValueError(f"unknown name filter: {k}")
+        key=(kind,*sorted((k,v if isinstance(v,(str,int)) else tuple(v)) for k,v in filters.items() if v is not None))
+        ids=self._pools.get(key)
+        if ids is None:
+            sets=[self._index.get(("kind",kind),set())]
+            for k,v in filters.items():
+                want=None if v is None else self._wanted(k,v)
+                if want is not None: sets.append(set().union(*(self._index.get((k,w),()) for w in want)))
+            sets.sort(key=len)
+            ids=tuple(sorted(sets[0].intersection(*sets[1:])))
+            with self._lock: self._pools[key]=ids
+        return ids
+
+    def count(self, kind="first", **filters): return len(self.pool(kind,**filters))
+
+    def sample(self, count, kind="first", seed=None, **filters):
+        ids=self.pool(kind,**filters)
+        return [self.names[i] for i in random.Random(seed).sample(ids,min(count,len(ids)))]
+
+    def full_names(self, count, seed=None, last=None, **filters):
+        # unique "First Last" pairs; surnames follow the rarity/origin filters unless `last` is given
+        if last is None: last={k:v for k,v in filters.items() if k in ("rarity","origin")}
+        # no surname of that rarity and origin: relax the rarity, then the origin
+        first=self.pool("first",**filters)
+        for drop in ((),("rarity",),("origin",),("rarity","origin")):
+            lasts=self.pool("last",**{k:v for k,v in last.items() if k not in drop})
+            if lasts: break
+        n=len(lasts); total=len(first)*n
+        return [f"{self.names[first[i//n]]} {self.names[lasts[i%n]]}"
+                for i in random.Random(seed).sample(range(total),min(count,total))]
+
+    def info(self, name, kind="first"):
+        i=self._ids[(kind,name)]
+        return {"name":name,"kind":kind,"gender":self.gender[i] or "-","rarity":self.rarity[i],
+                "origin":"/".join(self.origins[i]),"syllables":self.syllables[i]}
+
+    def export(self, out, count, kind="full", fmt="txt", seed=None, **filters):
+        # write `count` names to a path or text file; full names are written as first,last columns
+        if fmt not in FORMATS: raise ValueError(f"unknown format: {fmt}")
+        if isinstance(out,str):
+            with open(out,"w",encoding="utf-8",newline="") as f: return self.export(f,count,kind,fmt,seed,**filters)
+        if kind=="full":
+            rows=({"first":a,"last":b} for a,b in (n.split(" ",1) for n in self.full_names(count,seed,**filters)))
+        else:
+            rows=(self.info(n,kind) for n in self.sample(count,kind,seed,**filters))
+        written=0
+        if fmt=="csv":
+            w=None
+            for r in rows:
+                if w is None: w=csv.DictWriter(out,fieldnames=list(r)); w.writeheader()
+                w.writerow(r); written+=1
+        else:
+            for r in rows:
+                out.write((json.dumps(r) if fmt=="jsonl" else " ".join(map(str,(r["first"],r["last"]) if kind=="full" else (r["name"],))))+"\n")
+                written+=1
+        return written
+
+_default=None
+_default_lock=threading.Lock()
+
+def default_db():
+    global _default
+    with _default_lock:
+        if _default is None: _default=NameDB.load()
+        return _default
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(description="Sample or export character names")
+    ap.add_argument("-n","--count",type=int,default=10)
+    ap.add_argument("--kind",choices=("full","first","last"),default="full")
+    ap.add_argument("--gender"); ap.add_argument("--rarity")
+    ap.add_argument("--origin",nargs="+"); ap.add_argument("--initial",nargs="+")
+    ap.add_argument("--syllables",type=int,nargs="+")
+    ap.add_argument("--seed",type=int)
+    ap.add_argument("--format",choices=FORMATS,default="txt")
+    ap.add_argument("--names",default=NAMES_FILE,help="name database file")
+    ap.add_argument("-o","--output",help="file to write (default: stdout)")
+    a=ap.parse_args(argv)
+    db=NameDB.load(a.names)
+    filters={k:getattr(a,k) for k in FIELDS if getattr(a,k) is not None}
+    if a.kind=="last": filters.pop("gender",None); filters.pop("initial",None)
+    n=db.export(a.output or sys.stdout,a.count,a.kind,a.format,a.seed,**filters)
+    print(f"{n} names",file=sys.stderr)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from plush_utils import PATTERNS, analyze, merge_analyses, format_report, format_full_report, preload, stage
+
+CHAPTER_RE = PATTERNS["chapter"]
+CHUNK_CHARS = 40000
+PARALLEL_MIN_CHARS = 200000
+_HAS_WORD = PATTERNS["has_word"]
+
+def _cut(txt, pos):
+    # prefer paragraph breaks, then line breaks, then sentence ends
+    for sep in ("\n\n", "\n", ". "):
+        i=txt.find(sep,pos)
+        if i>=0: return i+len(sep)
+    return len(txt)
+
+def split_spans(txt, target=CHUNK_CHARS):
+    cuts=[m.start() for m in CHAPTER_RE.finditer(txt) if m.start()>0]
+    out=[]
+    for a,b in zip([0]+cuts,cuts+[len(txt)]):
+        while b-a>2*target:
+            c=_cut(txt,a+target)
+            if c>=b: break
+            out.append((a,c)); a=c
+        out.append((a,b))
+    # whitespace-only pieces would still count as one textstat sentence
+    return [(a,b) for a,b in out if _HAS_WORD.search(txt,a,b)]
+
+def split_chunks(txt, target=CHUNK_CHARS): return [txt[a:b] for a,b in split_spans(txt,target)]
+
+def _analyze_chunk(chunk, offset, watchlist, full): return analyze(chunk,watchlist,full,offset)
+
+def _counted(parts, total, progress):
+    if progress is None: yield from parts; return
+    progress(0,total)
+    for i,p in enumerate(parts,1):
+        progress(i,total); yield p
+
+@stage("analyze_chunks")
+def analyze_chunks(chunks, watchlist=None, full=False, workers=None, executor=None, progress=None):
+    # chunks: iterable of (text, offset) pairs; stages run inside worker processes are not recorded here.
+    # progress(done, total) is called as each chunk's result is merged.
+    chunks=list(chunks)
+    if not chunks: return analyze("",watchlist,full)
+    texts=[c for c,_ in chunks]; offs=[o for _,o in chunks]
+    args=(texts,offs,repeat(watchlist),repeat(full)); n=len(chunks)
+    # load the NLTK data here too, so a missing model fails, warns and tags cache keys in this process
+    if executor is not None or (n>1 and workers!=1): preload()
+    if executor is not None: return merge_analyses(_counted(executor.map(_analyze_chunk,*args),n,progress))
+    if n==1 or workers==1: return merge_analyses(_counted(map(_analyze_chunk,*args),n,progress))
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1,n)) as ex:
+        return merge_analyses(_counted(ex.map(_analyze_chunk,*args),n,progress))
+
+def analyze_parallel(txt, watchlist=None, full=False, workers=None, target=CHUNK_CHARS, executor=None, progress=None):
+    chunks=[(txt[a:b],a) for a,b in split_spans(txt,target)]
+    return analyze_chunks(chunks,watchlist,full,workers,executor,progress)
+
+def analyze_text_parallel(txt, style, watchlist=None, workers=None, executor=None, progress=None):
+    return format_report(analyze_parallel(txt,watchlist,workers=workers,executor=executor,progress=progress),style)
+
+def export_full_report_parallel(txt, style, workers=None, executor=None, progress=None):
+    return format_full_report(analyze_parallel(txt,full=True,workers=workers,executor=executor,progress=progress),style)
@@ -0,0 +1,68 @@
+import re
+
+# Token-based passive detection: an auxiliary "opens" a window of at most `max_gap` tokens in
+# which a past participle closes a match. No backtracking, so long run-on sentences cost the same
+# per token as short ones.
+AUXILIARIES = frozenset("""am is are was were be been being isn't aren't wasn't weren't
+isn’t aren’t wasn’t weren’t""".split())
+
+IRREGULAR_PARTICIPLES = frozenset("""arisen awoken awoke beaten become begun bent bet bid bitten bled blown borne born
+bound bred broken brought built burnt burst bought cast caught chosen clung come cost crept cut dealt dug done
+drawn dreamt driven drunk dwelt eaten fallen fed felt fought found fled flung flown forbidden forecast foregone
+foreseen foretold forgotten forgiven forsaken frozen gotten given gone ground grown hung heard hewn hidden hit held
+hurt kept knelt knit known laid led leant leapt learnt left lent let lain lit lost made meant met mislaid misled
+mistaken misunderstood mown outdone overcome overdone overheard overrun overseen overtaken overthrown paid proven
+put quit read rebuilt redone remade rent repaid reset retold rewritten rid ridden rung risen run sawn said seen
+sought sold sent set sewn shaken shorn shed shone shod shot shown shrunk shut sung sunk slain slept slid slung slit
+smitten sown spoken sped spelt spent spilt spun spit split spoilt spread sprung stood stolen stuck stung stunk
+strewn stridden stricken struck strung striven sworn swept swollen swum swung taken taught torn told thought thrown
+thrust trodden understood undergone undertaken undone upheld upset woken worn woven wed wept won wound withdrawn
+withheld withstood wrung written""".split())
+
+# -ed words that are not participles
+NOT_PARTICIPLES = frozenset("""bed hundred indeed kindred naked red sacred shred sled wicked""".split())
+
+# a determiner, relative pronoun or conjunction means the auxiliary's complement has moved on
+BARRIERS = frozenset("""a an the this that these those my your his her its our their who whom whose which what
+when where while because and or but if than""".split())
+
+TOKEN = re.compile(r"\w+(?:['’]\w+)*|[^\w\s]")
+
+def is_participle(w, participles=IRREGULAR_PARTICIPLES, exclude=NOT_PARTICIPLES):
+    if w in participles: return True
+    return len(w)>3 and w.endswith("ed") and not w.endswith("eed") and w not in exclude
+
+class PassiveDetector:
+    def __init__(self, auxiliaries=AUXILIARIES, participles=IRREGULAR_PARTICIPLES, max_gap=3,
+                 barriers=BARRIERS, exclude=NOT_PARTICIPLES):
+        self.auxiliaries=frozenset(auxiliaries); self.participles=frozenset(participles)
+        self.max_gap=max_gap; self.barriers=frozenset(barriers); self.exclude=frozenset(exclude)
+        alts="|".join(map(re.escape,sorted(self.auxiliaries,key=len,reverse=True)))
+        self._aux=re.compile(rf"(?<![\w'’])(?:{alts})(?![\w'’])")
+
+    def finditer(self, txt, lowered=False):
+        # yields (start, end) from the auxiliary to the participle, e.g. "was quickly taken".
+        # The regex engine skips to each auxiliary; from there at most max_gap tokens are read.
+        low=txt if lowered else txt.lower()
+        aux=self.auxiliaries; parts=self.participles; excl=self.exclude; bar=self.barriers; gap=self.max_gap
+        tok=TOKEN.search; done=0
+        for m in self._aux.finditer(low):
+            if m.start()<done: continue  # part of the previous match ("was being taken")
+            i=m.end(); seen=0
+            while (t:=tok(low,i)) is not None:
+                w=t.group(); i=t.end()
+                if w in aux: seen=0; continue
+                if is_participle(w,parts,excl):
+                    yield m.start(),i; done=i; break
+                if not w[0].isalnum() or w in bar or seen>=gap: break
+                seen+=1
+
+    def findall(self, txt, lowered=False): return list(self.finditer(txt,lowered))
+
+    def search(self, txt, lowered=False): return next(self.finditer(txt,lowered),None)
+
+_default=PassiveDetector()
+
+def default_detector(): return _default
+
+def passive_spans(txt): return _default.findall(txt)
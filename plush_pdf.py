@@ -0,0 +1,198 @@
+import os, threading, zlib
+from io import StringIO
+
+letter = (612.0, 792.0)
+
+_FONTS={"F1":"Helvetica","F2":"Helvetica-Bold"}
+
+# Lines outside cp1252 (Cyrillic, Greek, CJK, ...) are set in an embedded TrueType font, subset to
+# the characters used. PLUSH_PDF_FONT / PLUSH_PDF_FONT_BOLD pick it; otherwise the first of these
+# that exists. Characters no available font has become "?" and are counted in PdfStream.replaced.
+UNICODE_FONTS = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf","/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf","/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/TTF/DejaVuSans.ttf","/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf",None),
+    ("C:/Windows/Fonts/arial.ttf","C:/Windows/Fonts/arialbd.ttf"),
+]
+_ttfs=None
+_ttf_lock=threading.Lock()
+
+def unicode_fonts():
+    # {"F1": TTFont, "F2": TTFont} for the first font found, {} if there is none; loaded once
+    global _ttfs
+    with _ttf_lock:
+        if _ttfs is None:
+            reg,bold=os.environ.get("PLUSH_PDF_FONT"),os.environ.get("PLUSH_PDF_FONT_BOLD")
+            if not reg: reg,bold=next(((r,b) for r,b in UNICODE_FONTS if os.path.exists(r)),(None,None))
+            _ttfs={}
+            if reg:
+                from reportlab.pdfbase.ttfonts import TTFont
+                _ttfs["F1"]=TTFont("PlushUnicode",reg)
+                _ttfs["F2"]=TTFont("PlushUnicodeBold",bold) if bold and os.path.exists(bold) else _ttfs["F1"]
+        return _ttfs
+
+class _CharWidths(dict):
+    # per-character widths of a TrueType face, filled in as characters are met
+    def __init__(self, face): self.face=face
+    def __missing__(self, c): v=self[c]=self.face.getCharWidth(ord(c)); return v
+
+def _info_str(s):
+    # document info strings: PDFDocEncoding for ASCII, UTF-16 with a byte-order mark otherwise
+    return s.encode("ascii") if s.isascii() else b"\xfe\xff"+s.encode("utf-16-be")
+
+def _pdfstr(b): return b"("+b.replace(b"\\",b"\\\\").replace(b"(",b"\\(").replace(b")",b"\\)")+b")"
+
+class PdfStream:
+    # Writes pages to `out` as soon as they fill; only object offsets are kept in memory.
+    def __init__(self, out, pagesize=letter, margin=40, size=12, title_size=14, compress=True, title=None):
+        self.out=out; self.w,self.h=pagesize; self.margin=margin
+        self.size=size; self.title_size=title_size; self.compress=compress
+        from reportlab.pdfbase import pdfmetrics  # deferred: reportlab is slow to import
+        self.widths={k:pdfmetrics.getFont(v).widths for k,v in _FONTS.items()}
+        self.max_w=self.w-2*margin
+        self.pos=0; self.offsets={}; self.kids=[]; self.next_id=5
+        self.pages=0; self._ops=[]; self._y=None; self._cur=None
+        self.replaced=0; self._ttf=None; self._subsets={}; self._page_fonts=set()
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for i,(k,v) in enumerate(_FONTS.items()):
+            self._obj(3+i,b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"%v.encode())
+        self.title=title
+
+    def _write(self, b): self.out.write(b); self.pos+=len(b)
+
+    def _obj(self, n, body):
+        self.offsets[n]=self.pos
+        self._write(b"%d 0 obj\n"%n+body+b"\nendobj\n")
+
+    def _new_id(self):
+        n=self.next_id; self.next_id+=1; return n
+
+    def _wrap(self, b, w, size):
+        # b is cp1252 bytes with the base font's width table, or a str with a _CharWidths
+        limit=self.max_w*1000/size
+        if sum(w[c] for c in b)<=limit: return [b]
+        sp=b" " if isinstance(b,bytes) else " "
+        lines=[]; cur=b[:0]; cur_w=0; space=w[sp[0]]
+        for word in b.split(sp):
+            ww=sum(w[c] for c in word)
+            if cur and cur_w+space+ww<=limit:
+                cur+=sp+word; cur_w+=space+ww; continue
+            if cur: lines.append(cur)
+            while ww>limit:
+                n=0; acc=0
+                while n<len(word) and acc+w[word[n]]<=limit: acc+=w[word[n]]; n+=1
+                n=max(n,1); lines.append(word[:n]); word=word[n:]; ww=sum(w[c] for c in word)
+            cur=word; cur_w=ww
+        lines.append(cur)
+        return lines
+
+    def _flush_page(self):
+        if self._y is None: return
+        data=b"BT\n"+b"\n".join(self._ops)+b"\nET"
+        if self.compress: data=zlib.compress(data); head=b"<< /Length %d /Filter /FlateDecode >>"%len(data)
+        else: head=b"<< /Length %d >>"%len(data)
+        cid=self._new_id(); self._obj(cid,head+b"\nstream\n"+data+b"\nendstream")
+        pid=self._new_id(); self.kids.append(pid)
+        fonts=b"".join(b" /%s %d 0 R"%(k.encode(),self._subsets[k][0]) for k in sorted(self._page_fonts))
+        self._obj(pid,b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                      b"/Resources << /Font << /F1 3 0 R /F2 4 0 R%s >> >> >>"%(self.w,self.h,cid,fonts))
+        self.pages+=1; self._ops=[]; self._y=None; self._page_fonts=set()
+
+    def _unicode(self, text, font):
+        # text outside cp1252: (str, widths) for the embedded font, or cp1252 bytes with "?" for
+        # whatever cannot be shown
+        ttf=unicode_fonts().get(font)
+        if ttf is None:
+            out=[]
+            for c in text:
+                try: out.append(c.encode("cp1252"))
+                except UnicodeEncodeError: out.append(b"?"); self.replaced+=1
+            return b"".join(out),self.widths[font]
+        if self._ttf is None: self._ttf={}
+        w=self._ttf.get(font)
+        if w is None: w=self._ttf[font]=_CharWidths(ttf.face)
+        glyphs=ttf.face.charToGlyph; out=[]
+        for c in text:
+            if ord(c) in glyphs or c=="\xa0": out.append(c)
+            else: out.append("?"); self.replaced+=1
+        return "".join(out),w
+
+    def _set_font(self, name, size):
+        if self._cur!=(name,size):
+            self._ops.append(b"/%s %s Tf"%(name.encode(),b"%g"%size)); self._cur=(name,size)
+
+    def line(self, text, font="F1", size=None):
+        size=size or self.size; lead=size*1.2
+        text=text.replace("\t","    ")
+        try: b=text.encode("cp1252"); w=self.widths[font]
+        except UnicodeEncodeError: b,w=self._unicode(text,font)
+        for b in self._wrap(b,w,size):
+            if self._y is not None and self._y-lead<self.margin: self._flush_page()
+            if self._y is None:
+                self._y=self.h-self.margin
+                self._ops.append(b"1 0 0 1 %d %d Tm"%(self.margin,self._y))
+                self._cur=None
+            else:
+                self._y-=lead; self._ops.append(b"0 %s Td"%(b"%.2f"%-lead))
+            if isinstance(b,bytes):
+                self._set_font(font,size); self._ops.append(_pdfstr(b)+b" Tj"); continue
+            ttf=unicode_fonts()[font]
+            with _ttf_lock: parts=ttf.splitString(b,self)
+            for n,chunk in parts:
+                name=f"{font}U{n}"
+                if name not in self._subsets: self._subsets[name]=(self._new_id(),ttf,n)
+                self._page_fonts.add(name); self._set_font(name,size)
+                self._ops.append(_pdfstr(chunk)+b" Tj")
+
+    def _write_subsets(self):
+        # one simple TrueType font per 256-character subset, written once every page is out
+        from reportlab.pdfbase.ttfonts import SUBSETN, makeToUnicodeCMap, FF_SYMBOLIC, FF_NONSYMBOLIC
+        states={}
+        for name,(fid,ttf,n) in sorted(self._subsets.items()):
+            if id(ttf) not in states:
+                with _ttf_lock: states[id(ttf)]=ttf.state.pop(self).subsets
+            subset=states[id(ttf)][n]; face=ttf.face
+            base=SUBSETN(n)+b"+"+face.name+face.subfontNameX
+            data=face.makeSubset(subset); raw=len(data)
+            if self.compress: data=zlib.compress(data); filt=b" /Filter /FlateDecode"
+            else: filt=b""
+            ff=self._new_id(); self._obj(ff,b"<< /Length %d /Length1 %d%s >>\nstream\n"%(len(data),raw,filt)+data+b"\nendstream")
+            cmap=makeToUnicodeCMap(base.decode("latin-1"),subset).encode("latin-1")
+            if self.compress: cmap=zlib.compress(cmap)
+            tu=self._new_id(); self._obj(tu,b"<< /Length %d%s >>\nstream\n"%(len(cmap),filt)+cmap+b"\nendstream")
+            fd=self._new_id()
+            self._obj(fd,b"<< /Type /FontDescriptor /FontName /%s /Flags %d /FontBBox [%s] /ItalicAngle %d "
+                         b"/Ascent %d /Descent %d /CapHeight %d /StemV %d /MissingWidth %d /FontFile2 %d 0 R >>"
+                         %(base,(face.flags&~FF_NONSYMBOLIC)|FF_SYMBOLIC,b" ".join(b"%d"%v for v in face.bbox),
+                           face.italicAngle,face.ascent,face.descent,face.capHeight,face.stemV,face.defaultWidth,ff))
+            widths=b" ".join(b"%d"%face.getCharWidth(c) for c in subset)
+            self._obj(fid,b"<< /Type /Font /Subtype /TrueType /BaseFont /%s /FirstChar 0 /LastChar %d "
+                          b"/Widths [%s] /FontDescriptor %d 0 R /ToUnicode %d 0 R >>"%(base,len(subset)-1,widths,fd,tu))
+
+    def close(self):
+        self._flush_page()
+        if not self.kids: self.line(""); self._flush_page()
+        self._obj(2,b"<< /Type /Pages /Kids [%s] /Count %d >>"%(b" ".join(b"%d 0 R"%k for k in self.kids),len(self.kids)))
+        self._obj(1,b"<< /Type /Catalog /Pages 2 0 R >>")
+        if self._subsets: self._write_subsets()
+        info=self._new_id()
+        self._obj(info,b"<< /Producer (plush_toolkit) /Title %s >>"%_pdfstr(_info_str(self.title or "")))
+        xref=self.pos; n=self.next_id
+        rows=[b"xref\n0 %d\n0000000000 65535 f \n"%n]
+        rows+=[b"%010d 00000 n \n"%self.offsets[i] if i in self.offsets else b"0000000000 65535 f \n" for i in range(1,n)]
+        self._write(b"".join(rows))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"%(n,info,xref))
+        return self.pages
+
+def iter_lines(content):
+    for L in StringIO(content): yield L.rstrip("\n")
+
+def stream_pdf(out, title, lines, **kw):
+    # the closed PdfStream, for its pages and replaced counts
+    pdf=PdfStream(out,title=title,**kw)
+    pdf.line(title,"F2",pdf.title_size)
+    for L in lines: pdf.line(L)
+    pdf.close(); return pdf
+
+def write_pdf(out, title, lines, **kw): return stream_pdf(out,title,lines,**kw).pages
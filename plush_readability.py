@@ -0,0 +1,200 @@
+import importlib, math, re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+
+# textstat's readability formulas from a single count of the text. Every score is a function
+# of a few totals (words, sentences, syllables, long and unfamiliar words), so the text is
+# scanned once, syllables are memoized per word, and the scores are derived from the totals.
+# Totals of consecutive pieces add up, which is what the chapter and rolling curves use.
+
+# textstat's word rules: apostrophes survive only in contractions, other punctuation is dropped
+_QUOTE = re.compile(r"'(?![tsd]\b|ve\b|ll\b|re\b)")
+_PUNCT = re.compile(r"[^\w\s']")
+# textstat's sentence segments; segments of two words or fewer don't count
+SEGMENT = re.compile(r"\b[^.!?]+[.!?]*")
+# the words textstat checks against the Dale-Chall easy word list
+_VOCAB = re.compile(r"[\w\='‘’]+")
+
+FOG_SYLLABLES = 3     # textstat's English "syllable_threshold"
+SPACHE_SYLLABLES = 2
+
+def remove_punctuation(s): return _PUNCT.sub("",_QUOTE.sub('"',s))
+
+def _round(x, points=0):
+    # textstat's legacy rounding (half away from zero)
+    p=10**points; return math.floor(x*p+math.copysign(0.5,x))/p
+
+_pyphen=None
+
+def hyphenator():
+    global _pyphen
+    if _pyphen is None: _pyphen=importlib.import_module("pyphen").Pyphen(lang="en_US")
+    return _pyphen
+
+@lru_cache(maxsize=1<<16)
+def syllables(word):
+    # pyphen hyphenation points + 1, the count textstat uses; words repeat, so it is memoized
+    return len(hyphenator().positions(word))+1
+
+@lru_cache(maxsize=1<<16)
+def word_syllables(word):
+    # textstat's syllable_count for one raw token (0 when it is all punctuation)
+    return sum(map(syllables,remove_punctuation(word.lower()).split()))
+
+_easy=None
+
+def easy_words():
+    # the Dale-Chall list textstat ships with
+    global _easy
+    if _easy is None:
+        res=importlib.import_module("importlib.resources").files("textstat")/"resources"/"en"/"easy_words.txt"
+        _easy=frozenset(w.strip() for w in res.read_text(encoding="utf-8").splitlines())
+    return _easy
+
+@dataclass(slots=True)
+class Counts:
+    words: int = 0          # whitespace-separated tokens
+    lexicon: int = 0        # words left after punctuation is removed
+    segments: int = 0       # sentence segments of three words or more
+    syllables: int = 0
+    polysyllables: int = 0  # words of three syllables or more
+    chars: int = 0          # non-whitespace characters
+    letters: int = 0        # non-whitespace, non-punctuation characters
+    long_words: int = 0     # tokens longer than six characters (LIX)
+    long_lexicon: int = 0   # words longer than six characters (RIX)
+    unfamiliar: int = 0     # distinct words not on the easy word list
+    fog_words: int = 0      # ... of those, with FOG_SYLLABLES or more
+    spache_words: int = 0   # ... of those, with SPACHE_SYLLABLES or more
+    vocab: frozenset = None # the distinct unfamiliar words; None once summed over a window
+
+    @property
+    def sents(self): return max(1,self.segments)
+
+    def __add__(self, other):
+        # distinct-word counts only add up exactly while both sides still carry their vocab
+        vocab=self.vocab|other.vocab if self.vocab is not None and other.vocab is not None else None
+        out=Counts(*(getattr(self,k)+getattr(other,k) for k in _ADDITIVE))
+        if vocab is not None: out._set_vocab(vocab)
+        return out
+
+    def _set_vocab(self, vocab):
+        self.vocab=vocab; self.unfamiliar=len(vocab)
+        syl=[word_syllables(w) for w in vocab]
+        self.fog_words=sum(s>=FOG_SYLLABLES for s in syl)
+        self.spache_words=sum(s>=SPACHE_SYLLABLES for s in syl)
+        return self
+
+_ADDITIVE = ("words","lexicon","segments","syllables","polysyllables","chars","letters","long_words","long_lexicon")
+
+def text_counts(text):
+    words=text.split()
+    lex=remove_punctuation(text).split()
+    low=remove_punctuation(text.lower()).split()
+    syl=list(map(syllables,low))
+    easy=easy_words()
+    c=Counts(len(words),len(lex),
+             sum(1 for g in SEGMENT.findall(text) if len(remove_punctuation(g).split())>2),
+             sum(syl),sum(1 for s in syl if s>=3),sum(map(len,words)),
+             len(remove_punctuation("".join(words))),
+             sum(1 for w in words if len(w)>6),sum(1 for w in lex if len(w)>6))
+    return c._set_vocab(frozenset(w for w in set(_VOCAB.findall(text.lower())) if w not in easy))
+
+# ── Formulas (textstat 0.7, English) ─────────────────────────
+def _asl(c): return _round(c.lexicon/c.sents,1)
+
+def _asw(c): return _round(c.syllables/c.lexicon,1) if c.lexicon else 0.0
+
+def flesch_reading_ease(c): return _round(206.835-1.015*_asl(c)-84.6*_asw(c),2)
+
+def flesch_kincaid_grade(c): return _round(0.39*_asl(c)+11.8*_asw(c)-15.59,1)
+
+def gunning_fog(c):
+    if not c.lexicon: return 0.0
+    return _round(0.4*(_asl(c)+c.fog_words/c.lexicon*100),2)
+
+def smog_index(c):
+    if c.sents<3: return 0.0
+    return _round(1.043*(30*c.polysyllables/c.sents)**.5+3.1291,1)
+
+def coleman_liau_index(c):
+    lpw=_round(c.letters/c.lexicon,2) if c.lexicon else 0.0
+    spw=_round(c.sents/c.lexicon,2) if c.lexicon else 0.0
+    return _round(0.058*_round(lpw*100,2)-0.296*_round(spw*100,2)-15.8,2)
+
+def automated_readability_index(c):
+    if not c.lexicon: return 0.0
+    return _round(4.71*_round(c.chars/c.lexicon,2)+0.5*_round(c.lexicon/c.sents,2)-21.43,1)
+
+def dale_chall_readability_score(c):
+    if not c.lexicon: return 0.0
+    pdw=100-(c.lexicon-c.unfamiliar)/c.lexicon*100
+    return _round(0.1579*pdw+0.0496*_asl(c)+(3.6365 if pdw>5 else 0),2)
+
+def spache_readability(c):
+    if not c.lexicon: return 0.0
+    return _round(0.141*c.lexicon/c.sents+0.086*c.spache_words/c.lexicon*100+0.839,2)
+
+def lix(c):
+    if not c.words: return 0.0
+    return _round(_asl(c)+c.long_words*100/c.words,2)
+
+def rix(c): return _round(c.long_lexicon/c.sents,2)
+
+METRICS = {f.__name__:f for f in (flesch_reading_ease,flesch_kincaid_grade,gunning_fog,smog_index,
+           coleman_liau_index,automated_readability_index,dale_chall_readability_score,
+           spache_readability,lix,rix)}
+
+def scores(c, metrics=None):
+    if isinstance(c,str): c=text_counts(c)
+    return {m:METRICS[m](c) for m in metrics or METRICS}
+
+# ── Curves ───────────────────────────────────────────────────
+def segment_spans(text): return [m.span() for m in SEGMENT.finditer(text)]
+
+def _tile(text, spans):
+    # stretch spans to cover the text between them (quotes, stray punctuation), cutting only at
+    # whitespace, so a window's counts are the counts of its slice of the text
+    cuts=[]
+    for a,_ in spans:
+        while a>0 and not text[a-1].isspace(): a-=1
+        if not cuts or a>cuts[-1]: cuts.append(a)
+    if not cuts: return []
+    cuts[0]=0
+    return list(zip(cuts,cuts[1:]+[len(text)]))
+
+def span_curve(text, spans, metrics=None):
+    # one point per span, e.g. per chapter
+    return [{"start":a,"end":b,**scores(text_counts(text[a:b]),metrics)} for a,b in spans]
+
+def rolling_curve(text, window=20, step=1, spans=None, metrics=None):
+    # scores over `window` consecutive sentences (textstat's segments unless spans are given),
+    # moving `step` sentences at a time; counts are per sentence, summed by prefix sums, and
+    # distinct unfamiliar words are tracked as the window slides
+    spans=_tile(text,segment_spans(text) if spans is None else spans)
+    if not spans: return []
+    units=[text_counts(text[a:b]) for a,b in spans]
+    n=len(units); window=max(1,min(window,n))
+    sums={k:[0,*accumulate(getattr(u,k) for u in units)] for k in _ADDITIVE}
+    seen=Counter(); flags={}; fog=spache=0; lo=hi=0; out=[]
+    def add(w, d):
+        nonlocal fog, spache
+        f=flags.get(w)
+        if f is None:
+            s=word_syllables(w); f=flags[w]=(s>=FOG_SYLLABLES,s>=SPACHE_SYLLABLES)
+        fog+=d*f[0]; spache+=d*f[1]
+    for i in range(0,n-window+1,max(1,step)):
+        j=i+window
+        for u in units[lo:min(i,hi)]:
+            for w in u.vocab:
+                seen[w]-=1
+                if not seen[w]: del seen[w]; add(w,-1)
+        for u in units[max(i,hi):j]:
+            for w in u.vocab:
+                seen[w]+=1
+                if seen[w]==1: add(w,1)
+        lo,hi=i,j
+        c=Counts(*(sums[k][j]-sums[k][i] for k in _ADDITIVE),len(seen),fog,spache)
+        out.append({"first":i,"last":j-1,"start":spans[i][0],"end":spans[j-1][1],**scores(c,metrics)})
+    return out
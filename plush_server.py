@@ -0,0 +1,258 @@
+import argparse, base64, json, os, signal, socket, sys, threading, time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from plush_utils import (STYLE_PRESETS, preload, parse, analyze, format_report, format_full_report, cliche_hits,
+                         dialogue_lines, dialogue_stats, readability_report, readability_curve, clean_text, export_bytes)
+from plush_metrics import count, stage, prometheus_text
+
+# HTTP/JSON front end for the analyzers. The parent binds the socket and preloads the sentence
+# tokenizer, stopwords and cliché automaton, then forks workers that share them copy-on-write
+# and accept on the same socket. Each worker runs at most `inflight` requests at once and
+# answers 503 past that, so a client backs off instead of queueing behind a saturated worker.
+MAX_BYTES = 5 << 20
+MAX_BATCH = 64
+TIMEOUT = 30  # seconds a connection may sit idle or stall mid-request before it is dropped
+BODY_TIMEOUT = 60  # seconds the whole request body has to arrive in, however it is trickled
+EXPORT_TYPES = {"pdf":"application/pdf","docx":"application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+class BadRequest(ValueError):
+    pass
+
+def _text(req):
+    t=req.get("text")
+    if not isinstance(t,str): raise BadRequest("'text' must be a string")
+    return t
+
+def _watchlist(req):
+    w=req.get("watchlist")
+    if w is not None and not (isinstance(w,list) and all(isinstance(x,str) for x in w)):
+        raise BadRequest("'watchlist' must be a list of strings")
+    return w
+
+def _style(req):
+    s=req.get("style","None")
+    if s not in STYLE_PRESETS: raise BadRequest(f"unknown style: {s}")
+    return s
+
+# ── Operations ───────────────────────────────────────────────
+# each takes the decoded JSON request and returns a JSON-ready result (bytes for exports)
+def op_analyze(req):
+    style=_style(req); a=analyze(_text(req),_watchlist(req))
+    out={"report":format_report(a,style),"stats":a.readability}
+    if req.get("details"): out["analysis"]=a.to_dict()
+    return out
+
+def op_report(req):
+    style=_style(req); a=analyze(_text(req),full=True)
+    out={"report":format_full_report(a,style)}
+    if req.get("details"): out["analysis"]=a.to_dict()
+    return out
+
+def op_cliches(req):
+    hits=cliche_hits(_text(req))
+    return {"counts":dict(Counter(c for _,_,c in hits)),"hits":[list(h) for h in hits]}
+
+def op_dialogue(req):
+    d=parse(_text(req))
+    return {"lines":[{"start":h.start,"end":h.end,"text":h.text,"speaker":h.speaker} for h in dialogue_lines(d)],
+            "speakers":{n:{"lines":s.lines,"words":s.words} for n,s in dialogue_stats(d).items()}}
+
+def op_readability(req):
+    txt=_text(req); metrics=req.get("metrics"); out={"scores":readability_report(txt,metrics)}
+    curve=req.get("curve")  # "chapter" or a rolling window size in sentences
+    if curve is not None:
+        out["curve"]=readability_curve(txt,None if curve=="chapter" else int(curve),int(req.get("step",1)),metrics)
+    return out
+
+def op_clean(req): return {"text":clean_text(_text(req),bool(req.get("preserve_paragraphs")))}
+
+def op_export(req):
+    fmt=req.get("format","pdf")
+    if fmt not in EXPORT_TYPES: raise BadRequest(f"unknown format: {fmt}")
+    return export_bytes(req.get("title","Plush Export"),_text(req),fmt)
+
+OPS = {"analyze":op_analyze,"report":op_report,"cliches":op_cliches,"dialogue":op_dialogue,
+       "readability":op_readability,"clean":op_clean,"export":op_export}
+
+def run_op(name, req):
+    fn=OPS.get(name)
+    if fn is None: raise BadRequest(f"unknown op: {name}")
+    if not isinstance(req,dict): raise BadRequest("request must be a JSON object")
+    count("http_ops")
+    with stage(f"http_{name}"): return fn(req)
+
+def run_batch(req, limit):
+    items=req.get("items") if isinstance(req,dict) else None
+    if not isinstance(items,list): raise BadRequest("'items' must be a list")
+    if len(items)>limit: raise BadRequest(f"batch of {len(items)} exceeds {limit} items")
+    out=[]
+    for it in items:
+        try:
+            r=run_op(it.get("op") if isinstance(it,dict) else None,it)
+            if isinstance(r,bytes): r={"format":it.get("format","pdf"),"base64":base64.b64encode(r).decode()}
+            out.append({"ok":True,"result":r})
+        except (ValueError,KeyError,TypeError) as e: out.append({"ok":False,"error":str(e)})
+    return {"results":out}
+
+# ── HTTP ─────────────────────────────────────────────────────
+class Handler(BaseHTTPRequestHandler):
+    protocol_version="HTTP/1.1"
+    server_version="plush"
+    timeout=TIMEOUT
+
+    def log_message(self, *a): pass
+
+    def _send(self, code, body, ctype="application/json", headers=()):
+        if not isinstance(body,bytes): body=json.dumps(body,ensure_ascii=False).encode()
+        self.send_response(code); self.send_header("Content-Type",ctype)
+        self.send_header("Content-Length",str(len(body)))
+        for k,v in headers: self.send_header(k,v)
+        if self.close_connection: self.send_header("Connection","close")
+        self.end_headers(); self.wfile.write(body)
+
+    def _error(self, code, msg, close=False, headers=()):
+        # the unread body would be taken for the next request, so those answers close the connection
+        if close: self.close_connection=True
+        count(f"http_{code}"); self._send(code,{"error":msg},headers=headers)
+
+    def do_GET(self):
+        path=self.path.split("?")[0]
+        if path=="/health": self._send(200,self.server.plush.health())
+        elif path=="/metrics": self._send(200,prometheus_text().encode(),"text/plain; version=0.0.4")
+        else: self._error(404,"not found")
+
+    def do_POST(self):
+        p=self.server.plush; op=self.path.split("?")[0].strip("/")
+        if op!="batch" and op not in OPS: self._error(404,"not found",close=True); return
+        try: n=int(self.headers["Content-Length"])
+        except (TypeError,ValueError): self._error(411,"Content-Length required",close=True); return
+        if n>p.max_bytes: self._error(413,f"body over {p.max_bytes} bytes",close=True); return
+        # the body is read and decoded before taking an in-flight slot, so a slow client only
+        # holds a thread; the slot covers the analysis alone
+        body=self._body(n)
+        if body is None: self._error(408,"request body not received in time",close=True); return
+        try: req=json.loads(body)
+        except ValueError: self._error(400,"invalid JSON"); return
+        if not p.enter(): self._error(503,"busy",headers=(("Retry-After","1"),)); return
+        # the slot is released before the answer is written, so a client that sends its next
+        # request as soon as it reads this one never finds its own slot still taken
+        try: code,r=self._call(op,req,p)
+        finally: p.leave()
+        if code!=200: self._error(code,r); return
+        count("http_requests")
+        if isinstance(r,bytes): self._send(200,r,EXPORT_TYPES[req.get("format","pdf")])
+        else: self._send(200,r)
+
+    def _body(self, n, limit=BODY_TIMEOUT):
+        # `timeout` bounds each recv; this bounds the whole body. None if it is late or cut short.
+        end=time.monotonic()+limit; buf=bytearray()
+        try:
+            while len(buf)<n:
+                left=end-time.monotonic()
+                if left<=0: return None
+                self.connection.settimeout(min(left,self.timeout))
+                chunk=self.rfile.read1(n-len(buf))
+                if not chunk: return None
+                buf+=chunk
+        except OSError: return None
+        finally: self.connection.settimeout(self.timeout)
+        return bytes(buf)
+
+    def _call(self, op, req, p):
+        try: return 200,run_batch(req,p.max_batch) if op=="batch" else run_op(op,req)
+        except (ValueError,KeyError,TypeError) as e: return 400,str(e)
+        except Exception as e: return 500,f"{type(e).__name__}: {e}"
+
+class PlushServer:
+    def __init__(self, host="127.0.0.1", port=8765, workers=None, inflight=4, max_bytes=MAX_BYTES,
+                 max_batch=MAX_BATCH, backlog=256):
+        self.host=host; self.port=port; self.workers=workers or os.cpu_count() or 1
+        self.inflight=inflight; self.max_bytes=max_bytes; self.max_batch=max_batch; self.backlog=backlog
+        self.sock=None; self._httpd=None; self._children=set(); self._stopping=False
+        self._lock=threading.Lock(); self.active=0; self.started=time.time()
+
+    def enter(self):
+        with self._lock:
+            if self.active>=self.inflight: return False
+            self.active+=1; return True
+
+    def leave(self):
+        with self._lock: self.active-=1
+
+    def health(self):
+        return {"status":"ok","pid":os.getpid(),"active":self.active,"inflight":self.inflight,
+                "uptime":round(time.time()-self.started,1)}
+
+    def bind(self):
+        # bind and preload in the parent, before any fork
+        if self.sock is None:
+            self.sock=socket.create_server((self.host,self.port),backlog=self.backlog)
+            self.port=self.sock.getsockname()[1]
+            preload()
+        return self
+
+    def _serve(self):
+        srv=ThreadingHTTPServer((self.host,self.port),Handler,bind_and_activate=False)
+        srv.socket.close(); srv.socket=self.sock; srv.daemon_threads=True; srv.plush=self
+        self._httpd=srv; srv.serve_forever()
+
+    def start(self):
+        # in-process, on a daemon thread (embedding, tests)
+        self.bind(); threading.Thread(target=self._serve,daemon=True,name="plush-server").start()
+        return self
+
+    def _spawn(self):
+        pid=os.fork()
+        if pid==0:
+            signal.signal(signal.SIGINT,signal.SIG_IGN)
+            signal.signal(signal.SIGTERM,lambda *a: threading.Thread(target=self._httpd.shutdown).start())
+            code=0
+            try: self._serve(); self._drain()
+            except BaseException: code=1
+            os._exit(code)
+        self._children.add(pid)
+
+    def _drain(self, timeout=10):
+        # after shutdown: give in-flight requests a moment to finish
+        end=time.time()+timeout
+        while self.active and time.time()<end: time.sleep(0.05)
+
+    def _stop(self, *a):
+        self._stopping=True
+        for pid in list(self._children):
+            try: os.kill(pid,signal.SIGTERM)
+            except ProcessLookupError: pass
+
+    def serve_forever(self):
+        self.bind()
+        if self.workers<=1 or not hasattr(os,"fork"): self._serve(); return
+        for _ in range(self.workers): self._spawn()
+        signal.signal(signal.SIGTERM,self._stop); signal.signal(signal.SIGINT,self._stop)
+        while self._children:
+            try: pid,_=os.wait()
+            except ChildProcessError: break
+            except InterruptedError: continue
+            self._children.discard(pid)
+            if not self._stopping:
+                print(f"worker {pid} exited; restarting",file=sys.stderr); self._spawn()
+        self.sock.close()
+
+    def shutdown(self):
+        if self._httpd is not None: self._httpd.shutdown()
+        self._stop()
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(prog="plush_server",description="HTTP/JSON API for the plush analyzers")
+    ap.add_argument("--host",default="127.0.0.1")
+    ap.add_argument("-p","--port",type=int,default=8765)
+    ap.add_argument("-w","--workers",type=int,default=None,help="worker processes (default: CPU count)")
+    ap.add_argument("--inflight",type=int,default=4,help="concurrent requests per worker before 503")
+    ap.add_argument("--max-bytes",type=int,default=MAX_BYTES,help="largest request body (413 beyond)")
+    ap.add_argument("--max-batch",type=int,default=MAX_BATCH,help="most items per /batch request")
+    a=ap.parse_args(argv)
+    s=PlushServer(a.host,a.port,a.workers,a.inflight,a.max_bytes,a.max_batch).bind()
+    print(f"plush_server on http://{a.host}:{s.port} with {s.workers} workers",file=sys.stderr,flush=True)
+    s.serve_forever()
+
+if __name__=="__main__":
+    main()
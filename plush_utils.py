@@ -1,22 +1,112 @@
-import re, random, textstat, nltk
-from nltk.data import find
-from nltk.tokenize.punkt import PunktSentenceTokenizer
-from nltk.tokenize import wordpunct_tokenize
-from nltk.corpus import stopwords
-from striprtf.striprtf import rtf_to_text
-from docx import Document as DocxDocument
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import os, re, importlib, threading, warnings
 from datetime import datetime
 from io import BytesIO
 from collections import Counter
+from dataclasses import dataclass, field
+from plush_cache import cached, set_key_tags
+from plush_pdf import stream_pdf, iter_lines
+from plush_match import PhraseMatcher, load_phrases
+from plush_metrics import stage, count, collect, registry
+from plush_passive import PassiveDetector, default_detector
+from plush_clean import Normalizer, normalizer, add_rule, DEFAULT_RULES as CLEAN_RULES
+from plush_features import SentenceTable
+from plush_names import NameDB, default_db as default_names
+from plush_readability import (Counts, flesch_kincaid_grade, scores as readability_scores, span_curve, rolling_curve,
+                               hyphenator, easy_words)
+from plush_dialogue import DialogueEngine, Line, SpeakerStats, default_engine, speaker_stats, speaker_counts
 
-def ensure_nltk_data():
-    try: find("tokenizers/punkt")
-    except: nltk.download("punkt", quiet=True)
-    try: find("corpora/stopwords")
-    except: nltk.download("stopwords", quiet=True)
-ensure_nltk_data()
+# ── Lazy dependencies ────────────────────────────────────────
+# nltk, textstat, python-docx, striprtf and reportlab load on first use, and each NLTK
+# resource is looked up (and downloaded, unless PLUSH_OFFLINE is set) at most once.
+# With PLUSH_OFFLINE set a missing resource raises LookupError straight away. Otherwise it falls
+# back (untrained Punkt, FALLBACK_STOPWORDS) with a warning, and the fallback is tagged into result
+# cache keys so those results are never served to a process that has the real data.
+OFFLINE = os.environ.get("PLUSH_OFFLINE", "").lower() in ("1", "true", "yes")
+NLTK_RESOURCES = {"punkt": "tokenizers/punkt", "punkt_tab": "tokenizers/punkt_tab", "stopwords": "corpora/stopwords"}
+_modules={}
+_nltk_found={}
+_nltk_lock=threading.Lock()
+
+def _lazy(name):
+    m=_modules.get(name)
+    if m is None: m=_modules[name]=importlib.import_module(name)
+    return m
+
+def nltk_resource(package):
+    with _nltk_lock:
+        if package not in _nltk_found:
+            data=_lazy("nltk.data"); path=NLTK_RESOURCES.get(package,package)
+            try: data.find(path); ok=True
+            except LookupError:
+                ok=False
+                if not OFFLINE and _lazy("nltk").download(package,quiet=True):
+                    try: data.find(path); ok=True
+                    except LookupError: pass
+            _nltk_found[package]=ok
+        return _nltk_found[package]
+
+def ensure_nltk_data(): return {p:nltk_resource(p) for p in ("punkt","stopwords")}
+
+_fallbacks=set()
+
+def _missing_nltk(package, fallback):
+    if OFFLINE: raise LookupError(f"NLTK resource '{package}' is not installed and PLUSH_OFFLINE is set")
+    warnings.warn(f"NLTK resource '{package}' is unavailable; using {fallback}",RuntimeWarning,stacklevel=3)
+    with _nltk_lock: _fallbacks.add(package); set_key_tags(*sorted(_fallbacks))
+
+def rtf_to_text(txt): return _lazy("striprtf.striprtf").rtf_to_text(txt)
+
+def DocxDocument(*args): return _lazy("docx").Document(*args)
+
+# ── Shared tokenizers and patterns ───────────────────────────
+# Compiled once at import and shared read-only across sessions and worker threads.
+PATTERNS = {
+    "word":      re.compile(r"\w+(?:['’-]\w+)*"),
+    "wordpunct": re.compile(r"\w+|[^\w\s]+"),  # same pattern as nltk's WordPunctTokenizer
+    "has_word":  re.compile(r"\w"),
+    "paragraph": re.compile(r"\n[ \t\r]*\n"),
+    "was_were":  re.compile(r"\b(was|were)\b", re.I),
+    "chapter":   re.compile(r"^[ \t]*(?:chapter|part|book|prologue|epilogue)\b[^\n]*$", re.I | re.M),
+}
+
+def wordpunct_tokenize(s): return PATTERNS["wordpunct"].findall(s)
+
+DEFAULT_LANG = os.environ.get("PLUSH_LANG", "english")
+_tokenizers={}
+_tokenizer_lock=threading.Lock()
+
+def _load_punkt(lang):
+    punkt=_lazy("nltk.tokenize.punkt")
+    if hasattr(punkt,"PunktTokenizer") and nltk_resource("punkt_tab"):
+        try: return punkt.PunktTokenizer(lang)
+        except (LookupError,OSError,ValueError): pass
+    if nltk_resource("punkt"):
+        try: return _lazy("nltk.data").load(f"tokenizers/punkt/{lang}.pickle")
+        except (LookupError,OSError,ValueError): pass
+    # no trained model available: untrained Punkt still splits on sentence punctuation
+    _missing_nltk("punkt","untrained Punkt"); return punkt.PunktSentenceTokenizer()
+
+def sentence_tokenizer(lang=None):
+    lang=lang or DEFAULT_LANG
+    tok=_tokenizers.get(lang)
+    if tok is None:
+        with _tokenizer_lock:
+            tok=_tokenizers.get(lang)
+            if tok is None: tok=_tokenizers[lang]=_load_punkt(lang)
+    return tok
+
+def register_tokenizer(lang, tokenizer):
+    # any object with span_tokenize(text), e.g. a Punkt model trained on your own corpus
+    with _tokenizer_lock: _tokenizers[lang]=tokenizer
+
+def train_tokenizer(lang, train_text):
+    tok=_lazy("nltk.tokenize.punkt").PunktSentenceTokenizer(train_text)
+    register_tokenizer(lang,tok); return tok
+
+def preload(*langs):
+    for lang in langs or (DEFAULT_LANG,): sentence_tokenizer(lang)
+    cliche_matcher(); stopword_list()
+    hyphenator(); easy_words(); _lazy("numpy")  # readability and the feature table load these lazily
 
 FILLER_WORDS = ["just","really","very","that","actually","like","maybe","somewhat","perhaps","quite"]
 CLICHES = [ 
@@ -26,6 +116,7 @@ CLICHES = [
     "raining cats and dogs","think outside the box","every cloud has a silver lining",
     "pushing up daisies","barking up the wrong tree","blood ran cold","fit as a fiddle"
 ]
+CLICHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cliches.txt")
 STYLE_PRESETS = {
     "None":      {"emphasis":"","note":""},
     "Gritty":    {"emphasis":"Cliché detection, passive voice, long sentences","note":""},
@@ -35,11 +126,6 @@ STYLE_PRESETS = {
     "Sparse":    {"emphasis":"Minimal filler, clarity","note":""}
 }
 
-COMMON_MALE   = ["James","John","Robert","Michael","William","David","Richard","Joseph","Thomas","Charles"]
-COMMON_FEMALE = ["Mary","Patricia","Jennifer","Linda","Elizabeth","Barbara","Susan","Jessica","Sarah","Karen"]
-RARE_MALE     = ["Ansel","Blaise","Caius","Dorian","Elwood","Fintan","Gideon","Ivo","Leander","Montague"]
-RARE_FEMALE   = ["Aurelia","Briseis","Calista","Delphine","Elowen","Ferelith","Galatea","Isolde","Junia","Lysandra"]
-
 templates = {
     "Three-Act Beat Sheet": "...",  # full text omitted for brevity
     "Scene & Chapter Planner": "..."
@@ -47,83 +133,388 @@ templates = {
 
 def load_docx(f): return "\n".join(p.text for p in DocxDocument(f).paragraphs)
 
-def generate_docx(title, content):
+@stage("render_docx")
+def docx_from_lines(title, lines):
     doc = DocxDocument(); doc.add_heading(title,1)
-    for L in content.split("\n"): doc.add_paragraph(L)
-    b=BytesIO(); doc.save(b); b.seek(0); return b.getvalue()
-
-def generate_pdf(title, content):
-    b=BytesIO(); c=canvas.Canvas(b,pagesize=letter)
-    w,h=letter; tx=c.beginText(40,h-40)
-    tx.setFont("Helvetica-Bold",14); tx.textLine(title)
-    tx.setFont("Helvetica",12)
-    for L in content.split("\n"): tx.textLine(L)
-    c.drawText(tx); c.showPage(); c.save(); b.seek(0); return b.getvalue()
-
-def clean_text(txt):
-    return " ".join(txt.replace("“",""").replace("”",""")
-                   .replace("‘","'").replace("’","'")
-                   .replace("--","—").split())
-
-def detect_passive(txt):
-    toks=PunktSentenceTokenizer().tokenize(txt)
-    pat=re.compile(r'\b(was|were).*?\b\w+ed\b',re.I)
-    return [(i+1,s.strip()) for i,s in enumerate(toks) if pat.search(s)]
-
-def suggest(txt):
-    out=[]; toks=PunktSentenceTokenizer().tokenize(txt)
-    for i,s in enumerate(toks):
-        issues=[]
-        if len(wordpunct_tokenize(s))>30: issues.append("⚠️ Break it up")
-        if sum(s.lower().count(w) for w in FILLER_WORDS)>2: issues.append("✂️ Cut filler")
-        if re.search(r'\b(was|were)\b',s,re.I): issues.append("💡 Try active voice")
-        if issues: out.append(f"Sentence {i+1}:\n{s}\n" + "\n".join(issues))
-    return "\n\n".join(out) if out else "✅ All good!"
-
-def analyze_text(txt, style):
-    rpt=[]
+    for L in lines: doc.add_paragraph(L)
+    b=BytesIO(); doc.save(b); count("bytes_out",b.tell()); return b.getvalue()
+
+def generate_docx(title, content): return docx_from_lines(title, iter_lines(content))
+
+def pdf_from_lines(title, lines):
+    with stage("render_pdf"):
+        b=BytesIO(); pdf=stream_pdf(b,title,lines); count("bytes_out",b.tell())
+        # characters no available font can show come out as "?"
+        if pdf.replaced: count("pdf_replaced_chars",pdf.replaced)
+        return b.getvalue()
+
+def generate_pdf(title, content): return pdf_from_lines(title, iter_lines(content))
+
+EXPORTERS={"docx":generate_docx,"pdf":generate_pdf}
+
+def export_bytes(title, content, fmt):
+    return cached("export:"+fmt, lambda c,t: EXPORTERS[fmt](t,c), content, title)
+
+@stage("clean")
+def clean_text(txt, preserve_paragraphs=False, rules=CLEAN_RULES):
+    return normalizer(rules,preserve_paragraphs).normalize(txt)
+
+def clean_stream(chunks, preserve_paragraphs=False, rules=CLEAN_RULES):
+    # chunks: any iterable of text pieces (e.g. plush_io.open_stream); yields cleaned pieces
+    return normalizer(rules,preserve_paragraphs).stream(chunks)
+
+# used when the NLTK stopwords corpus is unavailable
+FALLBACK_STOPWORDS = """a about above after again against all am an and any are as at be because been before being
+below between both but by can did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not now of
+off on once only or other our ours ourselves out over own same she should so some such than that the their theirs
+them themselves then there these they this those through to too under until up very was we were what when where
+which while who whom why will with you your yours yourself yourselves""".split()
+_stopwords=None
+
+def stopword_list():
+    global _stopwords
+    if _stopwords is None:
+        words=None
+        if nltk_resource("stopwords"):
+            try: words=_lazy("nltk.corpus").stopwords.words("english")
+            except (LookupError,OSError): pass
+        if words is None: _missing_nltk("stopwords","the built-in stopword list"); words=FALLBACK_STOPWORDS
+        _stopwords=words
+    return _stopwords
+
+def readability(words, sents, lexicon, syllables):
+    c=Counts(words=words,lexicon=lexicon,segments=sents,syllables=syllables)
+    return {"words":words,"sents":sents,"lexicon":lexicon,"syllables":syllables,
+            "avg_len":lexicon/sents if sents else float(lexicon),"grade":flesch_kincaid_grade(c)}
+
+class Doc:
+    # The text, its length-aligned lowercase copy and a columnar SentenceTable; sentence strings
+    # are sliced on demand.
+    __slots__=("text","lower","lang","table","_stats","_memo")
+    def __init__(self, txt, lang=None):
+        count("chars_in",len(txt))
+        self.text=txt; self.lower=lower_aligned(txt); self.lang=lang
+        with stage("sentences"): spans=list(sentence_tokenizer(lang).span_tokenize(txt))
+        count("sentences",len(spans))
+        self._stats=None; self._memo={}
+        with stage("features"):
+            self.table=SentenceTable.build(txt,self.lower,spans,_filler_keys(),PATTERNS["word"],
+                                           [a for a,_ in _passive_matches(self)],PATTERNS["was_were"])
+    def __len__(self): return len(self.table)
+    @property
+    def spans(self): return self.table.spans()
+    def sentence(self, i): return self.table.sentence(i)
+    def iter_lex(self):
+        # lowercase words per sentence, tokenized on demand
+        word=PATTERNS["word"].findall; low=self.lower
+        for a,b in zip(self.table.start.tolist(),self.table.end.tolist()): yield word(low,a,b)
+    @property
+    def n_words(self): return int(self.table.words.sum())
+    @property
+    def stats(self):
+        # the textstat counts, summed from the per-sentence columns
+        if self._stats is None:
+            t=self.table.totals(); self._stats=readability(t["words"],t["sents"],t["lexicon"],t["syllables"])
+        return self._stats
+
+    def memo(self, key, fn):
+        if key not in self._memo: self._memo[key]=fn(self)
+        return self._memo[key]
+
+_fillers=None
+
+def _filler_keys():
+    global _fillers
+    if _fillers is None: _fillers=frozenset(_word_index({"fillers":FILLER_WORDS}))
+    return _fillers
+
+def parse(txt, lang=None): return txt if isinstance(txt,Doc) else Doc(txt,lang)
+
+def lower_aligned(txt):
+    # keep offsets aligned with the original when lowercasing changes length (e.g. "İ")
+    low=txt.lower()
+    return low if len(low)==len(txt) else "".join(c.lower()[:1] for c in txt)
+
+# Single-purpose helpers take a Doc or a plain string: a Doc's memoized data is reused, a string
+# goes straight to the matcher or dialogue engine without sentence splitting and feature tables.
+def _lowered(txt): return txt.lower if isinstance(txt,Doc) else lower_aligned(txt)
+
+def _word_index(lists):
+    idx={}
+    for name,ws in lists.items():
+        for w in ws:
+            w=w.lower().replace("’","'"); names=idx.get(w,(w,()))[1]
+            # a word repeated or case-varied within one list still counts once for it
+            if name not in names: idx[w]=(w,names+(name,))
+            if "'" in w: idx[w.replace("'","’")]=idx[w]
+    return idx
+
+def word_frequencies(txt, watchlists=None):
+    # One pass over the sentence tokens; returns whole-word counts per list, per document and per sentence.
+    d=parse(txt)
+    def run(d):
+        lists={"fillers":FILLER_WORDS,"stopwords":stopword_list()}; lists.update(watchlists or {})
+        idx=_word_index(lists); doc={n:Counter() for n in lists}; per=[]
+        for toks in d.iter_lex():
+            sc={}
+            for w in toks:
+                hit=idx.get(w)
+                if hit is None: continue
+                for n in hit[1]:
+                    c=sc.get(n)
+                    if c is None: c=sc[n]=Counter()
+                    c[hit[0]]+=1; doc[n][hit[0]]+=1
+            per.append(sc)
+        return {"doc":doc,"sentences":per}
+    run=stage("frequencies")(run)
+    if not watchlists: return d.memo("freq",run)
+    return run(d)
+
+_cliches=None
+
+def cliche_matcher():
+    global _cliches
+    if _cliches is None:
+        m=PhraseMatcher(CLICHES)
+        if os.path.exists(CLICHE_FILE):
+            for c in load_phrases(CLICHE_FILE): m.add(c)
+        _cliches=m.build()
+    return _cliches
+
+def load_cliches(*paths, replace=False):
+    global _cliches
+    m=PhraseMatcher(() if replace else cliche_matcher().phrases)
+    for p in paths:
+        for c in load_phrases(p): m.add(c)
+    _cliches=m.build(); return len(m)
+
+def cliche_hits(txt): return cliche_matcher().findall(_lowered(txt),lowered=True)
+
+@stage("cliches")
+def find_cliches(txt):
+    found=cliche_matcher().counts(_lowered(txt),lowered=True)
+    return "\n".join(f"{c}: {n}" for c,n in found.items()) if found else "None"
+
+# ── Structured results ───────────────────────────────────────
+@dataclass(slots=True)
+class Span:
+    start: int
+    end: int
+    text: str
+
+@dataclass(slots=True)
+class SentenceHit:
+    index: int   # 1-based sentence number
+    start: int
+    end: int
+    text: str
+    issues: tuple = ()
+
+@dataclass(slots=True)
+class Analysis:
+    # Raw counts plus numbered, character-addressed findings for one text. Analyses of
+    # consecutive chunks merge into the analysis of the whole; the formatters work off them.
+    words: int = 0
+    sents: int = 0
+    lexicon: int = 0
+    syllables: int = 0
+    n_sentences: int = 0
+    chars: int = 0
+    fillers: Counter = field(default_factory=Counter)
+    watch: Counter = None
+    long: list = field(default_factory=list)
+    passive: list = field(default_factory=list)
+    suggestions: list = field(default_factory=list)
+    speakers: Counter = None       # attributed dialogue lines per speaker
+    speaker_words: Counter = None  # words spoken per speaker
+    dialogue: list = None
+    cliches: list = None
+
+    @property
+    def readability(self): return readability(self.words,self.sents,self.lexicon,self.syllables)
+
+    def cliche_counts(self): return Counter(h.text for h in self.cliches or ())
+
+    def to_dict(self):
+        d={k:getattr(self,k) for k in self.__slots__}
+        for k in ("fillers","watch","speakers","speaker_words"):
+            if d[k] is not None: d[k]=dict(d[k])
+        for k in ("long","passive","suggestions","dialogue","cliches"):
+            if d[k] is not None: d[k]=[[*(getattr(h,f) for f in h.__slots__)] for h in d[k]]
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        a=cls(**{k:d[k] for k in ("words","sents","lexicon","syllables","n_sentences","chars")})
+        a.fillers=Counter(d["fillers"])
+        for k in ("watch","speakers","speaker_words"):
+            if d.get(k) is not None: setattr(a,k,Counter(d[k]))
+        for k in ("long","passive","suggestions"):
+            setattr(a,k,[SentenceHit(i,s,e,t,tuple(x)) for i,s,e,t,x in d[k]])
+        if d.get("dialogue") is not None: a.dialogue=[Line(*h) for h in d["dialogue"]]
+        if d.get("cliches") is not None: a.cliches=[Span(*h) for h in d["cliches"]]
+        return a
+
+def _passive_matches(d): return d.memo("passive",lambda d: default_detector().findall(d.lower,lowered=True))
+
+def _passive_spans(d, off=0): return [Span(a+off,b+off,d.text[a:b]) for a,b in _passive_matches(d)]
+
+def _hits(d, idx, off=0, strip=False):
+    t=d.table; st=t.start; en=t.end
+    return [SentenceHit(i+1,int(st[i])+off,int(en[i])+off,t.sentence(i).strip() if strip else t.sentence(i)) for i in idx.tolist()]
+
+@stage("passive")
+def _passive(d, off=0):
+    # sentences holding at least one auxiliary + participle match
+    return _hits(d,d.table.passive.nonzero()[0],off,strip=True)
+
+def detect_passive(txt): return [(h.index,h.text) for h in _passive(parse(txt))]
+
+def passive_spans(txt): return _passive_spans(parse(txt))
+
+@stage("suggestions")
+def _suggestions(d, off=0):
+    t=d.table; long=t.tokens>30; filler=t.fillers>2; ww=t.was_were
+    out=_hits(d,(long|filler|ww).nonzero()[0],off)
+    for h in out:
+        i=h.index-1
+        h.issues=tuple(x for x,on in (("⚠️ Break it up",long[i]),("✂️ Cut filler",filler[i]),("💡 Try active voice",ww[i])) if on)
+    return out
+
+def _lines(d):
+    if not isinstance(d,Doc): return default_engine().lines(d)
+    return d.memo("dialogue",lambda d: default_engine().lines(d.text))
+
+@stage("dialogue")
+def _dialogue(d, off=0):
+    return [Line(h.start+off,h.end+off,h.text,h.speaker) for h in _lines(d)] if off else list(_lines(d))
+
+def _speakers(d): return speaker_counts(_lines(d))
+
+@stage("analyze")
+def analyze(txt, watchlist=None, full=False, offset=0):
+    with stage("parse"): d=parse(txt)
+    st=d.stats
+    freq=word_frequencies(d,{"watch":watchlist} if watchlist else None)["doc"]
+    a=Analysis(st["words"],st["sents"],st["lexicon"],st["syllables"],len(d),len(d.text),
+               freq["fillers"],freq.get("watch"),_hits(d,d.table.long(),offset),
+               _passive(d,offset),_suggestions(d,offset))
+    if full:
+        a.dialogue=_dialogue(d,offset); a.speakers,a.speaker_words=_speakers(d)
+        with stage("cliches"): a.cliches=[Span(x+offset,y+offset,c) for x,y,c in cliche_matcher().findall(d.lower,lowered=True)]
+    return a
+
+def merge_analyses(parts):
+    out=Analysis()
+    for p in parts:
+        off=out.n_sentences
+        for k in ("words","sents","lexicon","syllables","n_sentences","chars"): setattr(out,k,getattr(out,k)+getattr(p,k))
+        for k in ("fillers","watch","speakers","speaker_words"):
+            v=getattr(p,k)
+            if v is not None:
+                if getattr(out,k) is None: setattr(out,k,Counter())
+                getattr(out,k).update(v)
+        for k in ("long","passive","suggestions"):
+            getattr(out,k).extend(SentenceHit(h.index+off,h.start,h.end,h.text,h.issues) for h in getattr(p,k))
+        for k in ("dialogue","cliches"):
+            v=getattr(p,k)
+            if v is not None:
+                if getattr(out,k) is None: setattr(out,k,[])
+                getattr(out,k).extend(v)
+    return out
+
+# ── Formatters ───────────────────────────────────────────────
+def _suggestion_blocks(hits):
+    if not hits: yield "✅ All good!"; return
+    for i,h in enumerate(hits):
+        if i: yield ""
+        yield f"Sentence {h.index}:\n{h.text}\n" + "\n".join(h.issues)
+
+def report_blocks(a, style):
+    st=a.readability
     if style!="None":
-        rpt += [f"🎨 {style}", STYLE_PRESETS[style]["emphasis"], ""]
-    rpt += [
-      f"• Words: {len(txt.split())}",
-      f"• Sents: {textstat.sentence_count(txt)}",
-      f"• Avg len: {textstat.words_per_sentence(txt):.2f}",
-      f"• Grade: {textstat.flesch_kincaid_grade(txt):.2f}", ""
-    ]
-    rpt.append("🔎 Fillers:")
+        yield from (f"🎨 {style}", STYLE_PRESETS[style]["emphasis"], "")
+    yield from (f"• Words: {st['words']}", f"• Sents: {st['sents']}",
+                f"• Avg len: {st['avg_len']:.2f}", f"• Grade: {st['grade']:.2f}", "")
+    yield "🔎 Fillers:"
     for w in FILLER_WORDS:
-        c=txt.lower().split().count(w)
-        if c: rpt.append(f" - {w}: {c}")
-    rpt.append("\n⚠️ Long sents:")
-    for i,s in enumerate(PunktSentenceTokenizer().tokenize(txt)):
-        if len(wordpunct_tokenize(s))>30: rpt.append(f"{i+1}: {s}")
-    rpt.append("\n🕵️ Passive:")
-    pv=detect_passive(txt)
-    rpt += [f"{n}: {s}" for n,s in pv] if pv else ["✅ None"]
-    rpt.append("\n🤖 Suggestions:\n"+suggest(txt))
-    return "\n\n".join(rpt)
-
-def extract_dialogue(txt): return "\n".join(re.findall(r'[“"]([^“”"]+)[”"]',txt))
-
-def dialogue_by_character(txt):
-    pat=r'"[^"]*?"\s+(?:said|asked|replied)\s+([A-Z][a-zA-Z]*)'
-    names=re.findall(pat,txt)
-    return "\n".join(f"{n}: {c}" for n,c in Counter(names).items()) if names else "None"
+        if a.fillers[w]: yield f" - {w}: {a.fillers[w]}"
+    if a.watch is not None:
+        yield "\n👀 Watchlist:"
+        yield from ([f" - {w}: {n}" for w,n in a.watch.most_common()] or ["✅ None"])
+    yield "\n⚠️ Long sents:"
+    for h in a.long: yield f"{h.index}: {h.text}"
+    yield "\n🕵️ Passive:"
+    yield from ([f"{h.index}: {h.text}" for h in a.passive] if a.passive else ["✅ None"])
+    yield "\n🤖 Suggestions:\n"+"\n".join(_suggestion_blocks(a.suggestions))
 
-def find_cliches(txt):
-    found=[c for c in CLICHES if c in txt.lower()]
-    return "\n".join(found) if found else "None"
-
-def export_full_report(txt, style):
-    dt=datetime.now().strftime("%Y-%m-%d %H:%M")
-    parts=[f"Full Report | {dt}", analyze_text(txt,style),
-           "\n=== Dialogue ===\n"+dialogue_by_character(txt),
-           "\n=== Extracted ===\n"+extract_dialogue(txt),
-           "\n=== Clichés ===\n"+find_cliches(txt)]
-    return "\n\n".join(parts)
-
-def generate_names(gender, rarity, count):
-    pool=[]
-    if gender in ("Any","Male"): pool += (RARE_MALE if rarity=="Rare" else COMMON_MALE)
-    if gender in ("Any","Female"): pool += (RARE_FEMALE if rarity=="Rare" else COMMON_FEMALE)
-    return random.sample(pool, min(count,len(pool)))
+def full_report_blocks(a, style):
+    yield f"Full Report | {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+    yield "\n\n".join(report_blocks(a,style))
+    yield "\n=== Dialogue ===\n"+_format_speakers(a.speakers,a.speaker_words)
+    yield "\n=== Extracted ===\n"+"\n".join(h.text for h in a.dialogue)
+    cl=a.cliche_counts()
+    yield "\n=== Clichés ===\n"+("\n".join(f"{c}: {n}" for c,n in cl.items()) if cl else "None")
+
+@stage("format")
+def format_report(a, style): return "\n\n".join(report_blocks(a,style))
+
+@stage("format")
+def format_full_report(a, style): return "\n\n".join(full_report_blocks(a,style))
+
+def report_lines(blocks):
+    for i,b in enumerate(blocks):
+        if i: yield ""
+        yield from b.split("\n")
+
+def render_report(a, style, fmt="txt", title=None, full=False):
+    blocks=full_report_blocks(a,style) if full else report_blocks(a,style)
+    title=title or ("Full Report" if full else "Analysis Report")
+    if fmt=="txt": return "\n\n".join(blocks)
+    if fmt=="docx": return docx_from_lines(title,report_lines(blocks))
+    if fmt=="pdf": return pdf_from_lines(title,report_lines(blocks))
+    raise ValueError(f"unknown format: {fmt}")
+
+def suggest(txt): return "\n".join(_suggestion_blocks(_suggestions(parse(txt))))
+
+def extract_dialogue(txt): return "\n".join(h.text for h in _lines(txt))
+
+def dialogue_lines(txt): return _dialogue(txt)
+
+def _format_speakers(lines, words=None):
+    if not lines: return "None"
+    return "\n".join(f"{n}: {c}" + (f" ({words[n]} words)" if words else "") for n,c in lines.most_common())
+
+def dialogue_by_character(txt): return _format_speakers(*_speakers(txt))
+
+def dialogue_stats(txt): return speaker_stats(_lines(txt))
+
+@stage("readability")
+def readability_report(txt, metrics=None):
+    # every textstat score from one count of the text
+    return readability_scores(txt.text if isinstance(txt,Doc) else txt,metrics)
+
+@stage("readability")
+def readability_curve(txt, window=None, step=1, metrics=None):
+    # one point per chapter, or per `window` consecutive sentences moving `step` at a time
+    if window is None:
+        t=txt.text if isinstance(txt,Doc) else txt
+        cuts=[m.start() for m in PATTERNS["chapter"].finditer(t) if m.start()>0]
+        return span_curve(t,list(zip([0]+cuts,cuts+[len(t)])),metrics)
+    d=parse(txt); return rolling_curve(d.text,window,step,d.spans,metrics)
+
+def analyze_text(txt, style, watchlist=None): return format_report(analyze(txt,watchlist),style)
+
+def export_full_report(txt, style): return format_full_report(analyze(txt,full=True),style)
+
+def generate_names(gender, rarity, count, seed=None, **filters):
+    # first names from the name database; filters: origin, initial, syllables
+    return default_names().sample(count,"first",seed,gender=gender,rarity=rarity,**filters)
+
+def generate_last_names(rarity, count, seed=None, **filters):
+    return default_names().sample(count,"last",seed,rarity=rarity,**filters)
+
+def generate_full_names(gender, rarity, count, seed=None, **filters):
+    # unique first/last pairs
+    return default_names().full_names(count,seed,gender=gender,rarity=rarity,**filters)